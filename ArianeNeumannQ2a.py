@@ -12,62 +12,191 @@ Description:
 
 User defined functions: 
     gc_content(sequence: str, window_size: int) -> list
+    gc_content_array(sequence: str, window_size: int) -> np.ndarray
+    gc_prefix_array, gc_content_batch, gc_batch
+    read_sequence_chunks, gc_content_stream, write_output
+    (read_sequence and read_records come from genome2bit.py, for fasta and ".2bit" files)
+
+    Both GC functions use a running (prefix) sum of G+C counts, so the time does
+    not depend on the window size anymore, only on the length of the sequence
+    (gc_content gives the values of gc_content_array as a list).
 
 Procedure:  
     1. open and run manage_examples.py in Spyder6 to populate directory
     2. Inspect the folder and familiarise yourself with the content
     3. Define function and set parameters
     4. Write output file
+    (for very large files the sequence can be streamed in chunks, then only the
+    current chunk and the last window are kept in memory)
 
 Input: 
-    input_file 
+    input_file (fasta, or a ".2bit" file made by genome2bit.py)
 
 Output: 
     2a_output_ArianeNeumann.txt
+    (batch mode: 2a_output_ArianeNeumann_w<window>_s<step>.bedGraph or .f32 + .f32.idx;
+    in the bedGraph every window value is written for the step-wide interval [start, start + step),
+    so the lines do not overlap and can be turned into a bigWig track)
 
 Usage: 
     python3 ArianeNeumannQ2a.py input_file output_file
 
 Version: 1.0 Date 2025-10-30 Author: Ariane Neumann
 """
+import numpy as np
+import genome2bit
+import seq_parser
+from genome2bit import read_sequence, read_records
+
 #========================== Defining functions =================================
 
+# Translation table turning G and C into byte 1 and every other letter into byte 0.
+# Like this the GC count of a window is just a sum over the translated bytes
+GC_TABLE = bytes(1 if chr(b) in "GC" else 0 for b in range(256))
+
 # Defining function setting parameters for the GC content
 def gc_content(sequence: str, window_size: int) -> list:  # this is a suggestion by Anna to better remember the exact type of the variables
-    gc_percent = [] # creating an empty list to enter the percentages
-    for i in range(len(sequence) - window_size + 1):
-        window = sequence[i:i + window_size]
-        gc_count = window.count('G') + window.count('C')
-        gc_percentage = (gc_count / window_size) * 100
-        gc_percent.append(round(gc_percentage, 1))
-    return gc_percent
-
-# Defining function to read the input file
-def read_sequence(input_file: str) -> str: # returns function as a string
-    with open(input_file, 'r') as a:
-        lines = a.readlines() # reading line by line
-        sequence = ''.join(line.strip() 
-                           for line in lines 
-                           if not line.startswith('>')) # removing header lines starting with ">"
-    return sequence.upper() # making sure that sequence letters all capital case
+    # gc_content_array rounds every window exactly like round(gc_percentage, 1), so the list is the same
+    # as with a loop over the windows, but the counting is done in NumPy without a Python int per base
+    return gc_content_array(sequence, window_size).tolist()
+
+# Defining function for the prefix sum as a NumPy array, used by the vectorised functions below
+def gc_prefix_array(sequence: str) -> np.ndarray:
+    gc_flags = np.frombuffer(sequence.encode("ascii", "replace").translate(GC_TABLE), dtype=np.uint8)
+    prefix = np.zeros(len(gc_flags) + 1, dtype=np.int64)
+    np.cumsum(gc_flags, out=prefix[1:])
+    return prefix
+
+# Defining function for the NumPy version of gc_content. Same windows, but the result
+# is a float array and all windows are calculated at once with cumsum instead of a loop
+def gc_content_array(sequence: str, window_size: int, step_size: int = 1, prefix=None) -> np.ndarray:
+    if len(sequence) < window_size:
+        return np.empty(0, dtype=np.float64) # no complete window, same as the empty list above
+    if prefix is None:
+        prefix = gc_prefix_array(sequence)
+    starts = np.arange(0, len(sequence) - window_size + 1, step_size) # first base of every window
+    gc_count = prefix[starts + window_size] - prefix[starts]
+    # np.round does not round like round() (e.g. 1 GC in 2000 bases: 0.0 instead of 0.1), so every
+    # possible count is rounded with round() itself once and the windows look their value up
+    low, high = int(gc_count.min()), int(gc_count.max())
+    if high - low < len(gc_count): # usual case: fewer possible counts than windows
+        counts = np.arange(low, high + 1)
+        positions = gc_count - low
+    else: # few windows of a huge size, only the counts that really occur
+        counts, positions = np.unique(gc_count, return_inverse=True)
+    rounded = np.array([round((count / window_size) * 100, 1) for count in counts.tolist()], dtype=np.float64)
+    return rounded[positions.reshape(-1)]
+
+# Defining function for several resolutions at once. window_sizes and step_sizes are paired
+# (first window with first step and so on). The prefix sum is built only once per sequence
+# and every resolution is read from it, so one pass gives the whole track pyramid
+def gc_content_batch(sequence: str, window_sizes: list, step_sizes: list) -> dict:
+    if len(window_sizes) != len(step_sizes):
+        raise ValueError("Every window size needs a step size")
+    prefix = gc_prefix_array(sequence)
+    results = {}
+    for window_size, step_size in zip(window_sizes, step_sizes):
+        results[(window_size, step_size)] = gc_content_array(sequence, window_size, step_size, prefix)
+    return results
+
+# Defining function to read the input file piece by piece instead of all at once.
+# It yields upper case chunks of about chunk_size bases, headers are skipped like in read_sequence
+def read_sequence_chunks(input_file: str, chunk_size: int = 1 << 20):
+    if input_file.endswith(".2bit"): # unpacking only one chunk at a time from the mapped file
+        genome = genome2bit.open_2bit(input_file)
+        for name in genome2bit.twobit_names(genome):
+            yield from genome2bit.twobit_chunks(genome, name, chunk_size)
+        return
+    pieces = [] # parser chunks collected for the current chunk
+    collected = 0
+    for _, _, chunk in seq_parser.read_fasta_chunks(input_file, chunk_size): # the parser never holds more than one block
+        pieces.append(chunk)
+        collected += len(chunk)
+        if collected >= chunk_size:
+            yield b"".join(pieces).upper().decode("ascii", "replace")
+            pieces = []
+            collected = 0
+    if pieces:
+        yield b"".join(pieces).upper().decode("ascii", "replace") # last, shorter chunk
+
+# Defining function for GC content on a stream of chunks. Only the last window_size - 1
+# bases are kept between chunks, so windows crossing a chunk border are still counted.
+# The values are the same as gc_content on the joined sequence, but memory stays fixed
+def gc_content_stream(chunks, window_size: int):
+    carry = '' # end of the previous chunk, needed for the windows crossing into the next chunk
+    for chunk in chunks:
+        buffer = carry + chunk
+        yield from gc_content(buffer, window_size)
+        carry = buffer[max(0, len(buffer) - (window_size - 1)):]
 
 # Defining function to write the output file
-def write_output(output_file):
-    output_file = "2a_output_ArianeNeumann.txt"
+def write_output(gc_values, output_file: str = "2a_output_ArianeNeumann.txt"):
     with open(output_file, 'w') as a:
-        for value in gc_values:
+        for value in gc_values: # works for a list and for values coming from gc_content_stream
             a.write(f"{value}\n") # writing values followed by new line
     print(f"GC content values written to {output_file}")
     
+# Defining function for the batch mode. Every record is read once and all resolutions are
+# written from it, either as bedGraph (record, start, end, GC%) or as a binary float32 file.
+# One output file is made per resolution, e.g. prefix_w1000_s500.bedGraph
+# In the bedGraph every value covers [window start, window start + step) (only the window if the step
+# is larger), so with step < window the lines do not overlap and bedGraphToBigWig accepts the file
+def gc_batch(input_file: str, window_sizes: list, step_sizes: list, output_prefix: str, output_format: str = "bedgraph"):
+    if output_format not in ("bedgraph", "binary"):
+        raise ValueError(f"Unknown output format '{output_format}', use bedgraph or binary")
+    if len(window_sizes) != len(step_sizes):
+        raise ValueError("Every window size needs a step size")
+    outputs = {}  # one open file per (window, step)
+    indexes = {}  # for binary output: record name, offset and number of values per record
+    for window_size, step_size in zip(window_sizes, step_sizes):
+        name = f"{output_prefix}_w{window_size}_s{step_size}"
+        if output_format == "bedgraph":
+            outputs[(window_size, step_size)] = open(f"{name}.bedGraph", 'w')
+        else:
+            outputs[(window_size, step_size)] = open(f"{name}.f32", 'wb')
+            indexes[(window_size, step_size)] = open(f"{name}.f32.idx", 'w')
+            indexes[(window_size, step_size)].write("#record\toffset\tcount\n")
+    try:
+        offsets = dict.fromkeys(outputs, 0)
+        for record, sequence in read_records(input_file):
+            results = gc_content_batch(sequence, window_sizes, step_sizes)
+            for (window_size, step_size), values in results.items():
+                out = outputs[(window_size, step_size)]
+                if output_format == "bedgraph":
+                    starts = range(0, len(values) * step_size, step_size) # 0-based start, as bedGraph wants it
+                    width = min(step_size, window_size) # overlapping windows would give overlapping intervals
+                    out.writelines(f"{record}\t{start}\t{start + width}\t{value:.1f}\n"
+                                   for start, value in zip(starts, values.tolist()))
+                else:
+                    values.astype(np.float32).tofile(out) # 4 bytes per window, readable with np.fromfile
+                    indexes[(window_size, step_size)].write(f"{record}\t{offsets[(window_size, step_size)]}\t{len(values)}\n")
+                    offsets[(window_size, step_size)] += len(values)
+    finally:
+        for out in list(outputs.values()) + list(indexes.values()):
+            out.close()
+    print(f"GC content for {len(outputs)} resolution(s) written to {output_prefix}_w*")
+    
 #============================= Calling functions ==============================
 
-# User input required entering file path
-input_file = input("Enter file path + file name here: ")
-sequence = read_sequence(input_file)
+if __name__ == "__main__":
+    # User input required entering file path
+    input_file = input("Enter file path + file name here: ")
 
-# User can decide actively on window size, suggested is a size of 5
-window_size = int(input("Enter window size: "))
+    # For chromosome sized files the sequence is streamed, so it never has to fit into memory.
+    # The batch mode handles every record separately and several window/step sizes at once
+    mode = input("Choose mode: list, stream (very large genomes) or batch (per record, several resolutions): ").strip().lower()
 
-# Based on user input, calculate the GC content and write output to file
-gc_values = gc_content(sequence, window_size)
-write_output(gc_values)
\ No newline at end of file
+    # Based on user input, calculate the GC content and write output to file
+    if mode == "batch": # batch mode writes its own files, one per window/step size
+        window_sizes = [int(size) for size in input("Enter window sizes separated by comma: ").split(',')]
+        step_sizes = [int(size) for size in input("Enter step sizes separated by comma (one per window size): ").split(',')]
+        output_format = input("Output format (bedgraph/binary): ").strip().lower()
+        gc_batch(input_file, window_sizes, step_sizes, "2a_output_ArianeNeumann", output_format)
+    else:
+        # User can decide actively on window size, suggested is a size of 5
+        window_size = int(input("Enter window size: "))
+        if mode == "stream":
+            write_output(gc_content_stream(read_sequence_chunks(input_file), window_size))
+        else:
+            sequence = read_sequence(input_file)
+            write_output(gc_content(sequence, window_size))
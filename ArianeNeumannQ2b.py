@@ -11,7 +11,10 @@ Description:
     Additionally the positions of the motif within the sequence should be displayed in a plot.
 
 User defined functions: 
-    read_sequence, find_motif, plot_positions
+    find_motif, single_motif_regex, find_motifs, reverse_complement, motif_to_regex, plot_positions,
+    build_motif_index, load_motif_index, find_motif_indexed, expand_motif, index_directory, kmer_code,
+    find_motif_approx, to_bits, bit_positions, find_motifs_parallel
+    (read_sequence, read_records and total_length come from genome2bit.py, for fasta and ".2bit" files)
 
 Procedure:  
     1. open and run manage_examples.py in Spyder6 to populate directory
@@ -19,64 +22,462 @@ Procedure:
     3. Define function and set parameters
     4. Request user input for sequence file and motif
     4. Display position of motif within sequence in plot
+    (several motifs with IUPAC codes can be searched on both strands in one scan with find_motifs)
 
 Input: 
-    input_file (for test purpose, "gene.fna" from BRCA1_dataset was used, motif was "TCTT")
+    input_file, fasta or ".2bit" from genome2bit.py (for test purpose, "gene.fna" from BRCA1_dataset was used, motif was "TCTT")
 
 Output: 
     2b_output_ArianeNeumann.png 
+    (optional: motif index folder "input_file.motifidx" next to the input file)
 
 Usage: 
     python3 ArianeNeumannQ2b.py input_file output_file
 
 Version: 1.0 Date 2025-10-30 Author: Ariane Neumann
 """
+import os
+import re
+import json
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from itertools import product
+import numpy as np
 import matplotlib.pyplot as plt
+from genome2bit import read_sequence, read_records, total_length
 
 # ================= Defining the functions =================
 
-# Defining function to read sequence
-def read_sequence(filename: str) -> str: # function will return a string
-    with open(filename, "r") as a:
-        lines = a.readlines() # reading all lines
-    seq = "".join(line.strip() # joining all lines, removing whitespace
-                  for line in lines 
-                  if not line.startswith(">")) # ignoring lines starting with fasta header ">"
-    return seq.upper() # returns a sequence in upper case
-
-# Defining function to find motif 1-based. This will start at python index 0
-def find_motif(sequence: str, motif: str) -> list: # return function as a list
-    motif = motif.upper() # making sure that all letters in motif are written with upper case
-    positions = [] # empty list for storing the positions detected within sequence
-    for i in range(len(sequence) - len(motif) + 1): 
-        if sequence[i:i+len(motif)] == motif: # searching within sequence for motif with specific length
-            positions.append(i + 1) # if motif within sequence, it will be appended
+# IUPAC codes for degenerate bases, written as regex character classes
+IUPAC_CODES = {
+    "A": "A", "C": "C", "G": "G", "T": "T",
+    "R": "[AG]", "Y": "[CT]", "S": "[CG]", "W": "[AT]", "K": "[GT]", "M": "[AC]",
+    "B": "[CGT]", "D": "[AGT]", "H": "[ACT]", "V": "[ACG]", "N": "[ACGT]",
+}
+
+# Complement of every IUPAC letter, used to build the reverse complement of a motif
+IUPAC_COMPLEMENT = str.maketrans("ACGTRYSWKMBDHVN", "TGCAYRSWMKVHDBN")
+
+# Defining function for the reverse complement of a motif (IUPAC letters stay IUPAC letters)
+def reverse_complement(motif: str) -> str:
+    return motif.upper().translate(IUPAC_COMPLEMENT)[::-1]
+
+# Defining function turning a motif with IUPAC letters into a regular expression
+def motif_to_regex(motif: str) -> str:
+    try:
+        return "".join(IUPAC_CODES[base] for base in motif.upper())
+    except KeyError as e:
+        raise ValueError(f"Motif '{motif}' contains a letter that is not an IUPAC code: {e}")
+
+# Base codes for the k-mer index. Every other letter (N etc.) is stored as A, such positions
+# are removed later when the hit is compared to the real sequence
+BASE_CODES = np.zeros(256, dtype=np.uint32)
+for code, base in enumerate("ACGT"):
+    BASE_CODES[ord(base)] = code
+IS_ACGT = np.zeros(256, dtype=bool) # letters a motif can match, like the regex classes above
+IS_ACGT[list(b"ACGT")] = True
+
+MAX_EXPANSION = 4096 # plain motifs one IUPAC motif may stand for in find_motifs, more are searched by regex
+SCAN_CHUNK = 1 << 22 # windows coded at a time by find_motifs
+
+# Defining function giving the 2-bit code of every window of `length` bases, chunk by chunk
+# (start of the chunk, codes, window is only A/C/G/T). Like kmer_code, but for all windows at once
+def _window_codes(seq: np.ndarray, length: int):
+    windows = len(seq) - length + 1
+    for start in range(0, max(windows, 0), SCAN_CHUNK):
+        count = min(SCAN_CHUNK, windows - start)
+        part = seq[start:start + count + length - 1]
+        bases = BASE_CODES[part].astype(np.uint64)
+        codes = np.zeros(count, dtype=np.uint64)
+        for j in range(length):
+            codes = (codes << np.uint64(2)) | bases[j:j + count]
+        other = np.zeros(len(part) + 1, dtype=np.int32) # running count of letters that are not A/C/G/T
+        np.cumsum(~IS_ACGT[part], out=other[1:])
+        yield start, codes, other[length:length + count] == other[:count]
+
+# Defining function to find many motifs on both strands at once. Every IUPAC motif (and its reverse
+# complement) is written out as plain motifs and turned into 2-bit codes, one sorted table per motif
+# length. The sequence is then coded window by window with NumPy and every window is looked up in the
+# table with np.searchsorted, so the work does not grow with the number of motifs and there is no
+# Python loop over positions or hits. Motifs longer than 32 bases (more than 64 bits) or standing
+# for more than MAX_EXPANSION plain motifs are searched with their own regular expression instead.
+# Returns {(motif, strand): [1-based positions]}, strand is "+" or "-". Positions on the
+# "-" strand are where the reverse complement starts on the given (+) sequence
+def find_motifs(sequence: str, motifs: list, both_strands: bool = True, index: dict = None) -> dict:
+    if index is not None: # with an index every motif and strand is a lookup instead of a scan
+        positions = {}
+        for motif in motifs:
+            motif = motif.upper()
+            positions[(motif, "+")] = find_motif_indexed(index, motif)
+            if both_strands:
+                positions[(motif, "-")] = find_motif_indexed(index, reverse_complement(motif))
+        return positions
+
+    patterns = {} # (motif, strand) -> motif as found on the given sequence
+    for motif in motifs:
+        motif = motif.upper()
+        motif_to_regex(motif) # stops with a ValueError on letters that are not IUPAC codes
+        patterns[(motif, "+")] = motif
+        if both_strands:
+            patterns[(motif, "-")] = reverse_complement(motif)
+    positions = {key: [] for key in patterns}
+    keys = list(patterns)
+
+    tables = {} # motif length -> ([codes], [key numbers])
+    for number, key in enumerate(keys):
+        pattern = patterns[key]
+        expansion = 1
+        for base in pattern:
+            expansion *= len(IUPAC_CODES[base].strip("[]"))
+        if not 0 < len(pattern) <= 32 or expansion > MAX_EXPANSION:
+            # the lookahead (?=...) matches without using up letters, so overlapping hits are found too
+            positions[key] = [hit.start() + 1 for hit in re.finditer(f"(?={motif_to_regex(pattern)})", sequence)]
+            continue
+        codes, numbers = tables.setdefault(len(pattern), ([], []))
+        for plain in expand_motif(pattern):
+            codes.append(kmer_code(plain))
+            numbers.append(number)
+    if not tables:
+        return positions
+
+    seq = np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)
+    found_numbers, found_starts = [], []
+    for length, (codes, numbers) in tables.items():
+        codes = np.array(codes, dtype=np.uint64)
+        order = np.argsort(codes, kind="stable")
+        codes, numbers = codes[order], np.array(numbers, dtype=np.int64)[order]
+        for start, window_codes, plain_window in _window_codes(seq, length):
+            first = np.searchsorted(codes, window_codes, side="left")
+            hit = plain_window & (first < len(codes))
+            hit[hit] &= codes[first[hit]] == window_codes[hit]
+            windows = np.flatnonzero(hit)
+            # the same plain motif can belong to several keys (e.g. a palindrome on both strands)
+            first = first[windows]
+            repeats = np.searchsorted(codes, window_codes[windows], side="right") - first
+            within = np.arange(repeats.sum()) - np.repeat(np.cumsum(repeats) - repeats, repeats) # 0, 1, .. per window
+            found_starts.append(np.repeat(windows + start, repeats))
+            found_numbers.append(numbers[np.repeat(first, repeats) + within])
+
+    if not found_starts: # sequence shorter than every motif of the tables, there is no window to look at
+        return positions
+    found_numbers = np.concatenate(found_numbers)
+    found_starts = np.concatenate(found_starts)
+    order = np.lexsort((found_starts, found_numbers)) # by key, then by position
+    found_numbers, found_starts = found_numbers[order], found_starts[order]
+    borders = np.searchsorted(found_numbers, np.arange(len(keys) + 1))
+    for number, key in enumerate(keys):
+        if borders[number + 1] > borders[number]:
+            positions[key] = (found_starts[borders[number]:borders[number + 1]] + 1).tolist() # 1-based like before
     return positions
 
-# Defining function for plot
-def plot_positions(positions: list, motif: str):
-    plt.figure(figsize=(8, 4))
-    plt.bar(positions, [1]*len(positions), color="teal")
+# Defining function for the default index file names, written next to the fasta file
+def index_directory(fasta_file: str) -> str:
+    return fasta_file + ".motifidx"
+
+# Defining function to build the motif index. For every position the following k bases are
+# turned into a number (k-mer code), the positions are sorted by that code and stored with the
+# start of every code block (offsets). A motif lookup then only reads one block instead of the genome.
+# The index is saved as .npy files so it can be memory-mapped by later runs
+def build_motif_index(fasta_file: str, index_dir: str = None, k: int = None) -> str:
+    index_dir = index_dir or index_directory(fasta_file)
+    os.makedirs(index_dir, exist_ok=True)
+    sequence = np.frombuffer(read_sequence(fasta_file).encode("ascii", "replace"), dtype=np.uint8)
+    n = len(sequence)
+    if k is None:
+        k = min(12, max(4, int(np.log(max(n, 1)) / np.log(4)))) # about one position per k-mer, at most 4^12 blocks
+
+    # k-mer code of every position, the end is padded with A so that every position gets a code
+    padded = np.concatenate([BASE_CODES[sequence], np.zeros(k - 1, dtype=np.uint32)])
+    codes = np.zeros(n, dtype=np.uint32)
+    for j in range(k):
+        codes = (codes << 2) | padded[j:j + n]
+
+    position_type = np.uint32 if n < 2**32 else np.int64
+    positions = np.argsort(codes, kind="stable").astype(position_type) # sorted by code, then by position
+    offsets = np.zeros(4**k + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=4**k), out=offsets[1:])
+
+    np.save(os.path.join(index_dir, "sequence.npy"), sequence)
+    np.save(os.path.join(index_dir, "positions.npy"), positions)
+    np.save(os.path.join(index_dir, "offsets.npy"), offsets)
+    source = os.stat(fasta_file)
+    with open(os.path.join(index_dir, "index.json"), "w") as a: # to see later if the fasta file was changed
+        json.dump({"k": k, "source_size": source.st_size, "source_mtime_ns": source.st_mtime_ns}, a)
+    return index_dir
+
+# Defining function to open the motif index memory-mapped. If there is no index yet, or the fasta
+# file changed since the index was built, the index is (re)built first
+def load_motif_index(fasta_file: str, index_dir: str = None) -> dict:
+    index_dir = index_dir or index_directory(fasta_file)
+    try:
+        with open(os.path.join(index_dir, "index.json")) as a:
+            meta = json.load(a)
+        source = os.stat(fasta_file)
+        stale = (meta["source_size"], meta["source_mtime_ns"]) != (source.st_size, source.st_mtime_ns)
+    except (FileNotFoundError, KeyError, ValueError):
+        stale = True
+    if stale:
+        print(f"Building motif index for {fasta_file}")
+        build_motif_index(fasta_file, index_dir)
+        with open(os.path.join(index_dir, "index.json")) as a:
+            meta = json.load(a)
+    return {
+        "k": meta["k"],
+        "sequence": np.load(os.path.join(index_dir, "sequence.npy"), mmap_mode="r"),
+        "positions": np.load(os.path.join(index_dir, "positions.npy"), mmap_mode="r"),
+        "offsets": np.load(os.path.join(index_dir, "offsets.npy"), mmap_mode="r"),
+    }
+
+# Defining function to write out all plain motifs (only A, C, G, T) described by an IUPAC motif
+def expand_motif(motif: str) -> list:
+    choices = [IUPAC_CODES[base].strip("[]") for base in motif.upper()]
+    return ["".join(bases) for bases in product(*choices)]
+
+# Defining function for the k-mer code of a plain motif (two bits per base, first base highest)
+def kmer_code(plain: str) -> int:
+    code = 0
+    for base in plain.encode():
+        code = (code << 2) | int(BASE_CODES[base])
+    return code
+
+# Letters of the sequence allowed for every IUPAC letter of a motif, as a lookup over all 256 byte values
+IUPAC_MASKS = {}
+for letter, bases in IUPAC_CODES.items():
+    IUPAC_MASKS[letter] = np.zeros(256, dtype=bool)
+    IUPAC_MASKS[letter][list(bases.strip("[]").encode())] = True
+
+# Defining function to look up a motif in the index. Only the first min(k, motif length) letters are
+# written out as plain k-mers and looked up, the block(s) of these k-mers give the candidates. All
+# letters are then checked against the mapped sequence with the IUPAC masks, so degenerate letters
+# after the first k do not multiply the number of lookups
+def find_motif_indexed(index: dict, motif: str) -> list:
+    k, sequence, positions, offsets = index["k"], index["sequence"], index["positions"], index["offsets"]
+    motif = motif.upper()
+    m = len(motif)
+    if m == 0 or m > len(sequence):
+        return []
+    key = motif[:min(k, m)]
+    expansion = 1
+    for base in key:
+        expansion *= len(IUPAC_CODES[base].strip("[]"))
+    if expansion > MAX_EXPANSION: # mostly N at the start, reading every position is cheaper than the lookups
+        candidates = np.arange(len(sequence) - m + 1, dtype=np.int64)
+    else:
+        blocks = []
+        shift = 4 ** (k - len(key)) # shorter motif: all k-mers starting with it lie next to each other in the index
+        for plain in expand_motif(key):
+            code = kmer_code(plain)
+            blocks.append(np.asarray(positions[offsets[code * shift]:offsets[(code + 1) * shift]], dtype=np.int64))
+        candidates = np.sort(np.concatenate(blocks))
+        candidates = candidates[candidates + m <= len(sequence)]
+    for j, letter in enumerate(motif): # removes hits on N, on the padding at the end and on the rest of the motif
+        candidates = candidates[IUPAC_MASKS[letter][sequence[candidates + j]]]
+    return (candidates + 1).tolist() # 1-based like find_motif
+
+# Defining function turning one motif into the regular expression of find_motif. Every letter matches
+# itself, like the plain comparison of the first version, and an IUPAC letter matches its bases as well
+# (N finds A, C, G, T and N). Letters that are not IUPAC codes (e.g. X) only match themselves
+def single_motif_regex(motif: str) -> str:
+    return "".join(f"[{IUPAC_CODES[base].strip('[]')}{base}]" if len(IUPAC_CODES.get(base, "")) > 1
+                   else re.escape(base) for base in motif.upper())
+
+# Defining function to find motif 1-based. This will start at python index 0.
+# One motif is searched with one regular expression scan (done in C), which is faster than the tables of
+# find_motifs for a single pattern. The lookahead (?=...) finds overlapping hits too.
+# With an index the IUPAC rules of find_motif_indexed apply instead (N in the sequence is never a hit)
+def find_motif(sequence: str, motif: str, index: dict = None) -> list: # return function as a list
+    motif = motif.upper() # making sure that all letters in motif are written with upper case
+    if index is not None:
+        return find_motif_indexed(index, motif) # memory-mapped index from load_motif_index
+    return [hit.start() + 1 for hit in re.finditer(f"(?={single_motif_regex(motif)})", sequence)]
+
+# Defining function to turn a 0/1 array into one big Python integer (bit i = position i).
+# Python integers can be shifted and combined with &, | and ~ for any length, which is done in C
+def to_bits(mask: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+# Defining function for the way back: all positions where the bit is set
+def bit_positions(bits: int, length: int) -> np.ndarray:
+    raw = np.frombuffer(bits.to_bytes((length + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little")[:length])
+
+# Defining function for motif search allowing up to max_mismatches substitutions (Hamming distance).
+# This is the bit-parallel Shift-Add idea turned around: instead of one machine word per sequence
+# position, every motif position works on a bit vector over ALL start positions at once.
+# mismatch_at_least[i] has bit p set when the window starting at p has at least i mismatches,
+# so for every motif letter only max_mismatches + 1 big integer operations are needed.
+# Returns a list of (1-based position, number of mismatches), IUPAC letters are allowed in the motif
+def find_motif_approx(sequence: str, motif: str, max_mismatches: int = 1) -> list:
+    motif = motif.upper()
+    starts = len(sequence) - len(motif) + 1 # number of windows
+    if not motif or starts <= 0:
+        return []
+    seq = np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)
+    base_bits = {base: to_bits(seq == ord(base)) for base in "ACGT"} # one bit vector per base
+    all_starts = (1 << starts) - 1
+
+    mismatch_at_least = [all_starts] + [0] * (max_mismatches + 1)
+    for j, letter in enumerate(motif):
+        matching = 0
+        for base in IUPAC_CODES[letter].strip("[]"): # base is allowed at this motif position
+            matching |= base_bits[base]
+        mismatch = ~(matching >> j) & all_starts # start positions where letter j does not fit
+        for i in range(max_mismatches + 1, 0, -1): # counting up, like a carry in an adder
+            mismatch_at_least[i] |= mismatch_at_least[i - 1] & mismatch
+
+    hits = ~mismatch_at_least[max_mismatches + 1] & all_starts
+    positions = bit_positions(hits, starts)
+    mismatches = np.zeros(len(positions), dtype=np.int64)
+    for i in range(1, max_mismatches + 1):
+        mismatches += np.unpackbits(np.frombuffer(mismatch_at_least[i].to_bytes((starts + 7) // 8, "little"),
+                                                  dtype=np.uint8), bitorder="little")[positions]
+    return list(zip((positions + 1).tolist(), mismatches.tolist()))
+
+# Shared memory block of the worker process, attached once when the worker starts
+_shared_sequences = None
+
+def _attach_shared(name: str):
+    global _shared_sequences
+    _shared_sequences = SharedMemory(name=name)
+
+# Defining the worker function. It reads its chunk straight from the shared memory (only the
+# chunk coordinates are sent to the worker, never the sequence) and keeps only hits that start
+# inside its own part, the overlap is there for motifs reaching into the next chunk
+def _scan_chunk(task):
+    record, start, end, read_end, motifs, both_strands = task
+    chunk = bytes(_shared_sequences.buf[start:read_end]).decode("ascii")
+    hits = find_motifs(chunk, motifs, both_strands)
+    own_length = end - start
+    return record, start, {key: [position for position in motif_positions if position <= own_length]
+                           for key, motif_positions in hits.items()}
+
+# Defining function to scan many records on all cores. The records are copied one by one into one shared
+# memory block, big records are cut into chunks of chunk_size bases overlapping by (longest motif - 1).
+# records can be a list, or a generator like read_records together with total (number of bases of all
+# records, see total_length), then only one record at a time is held outside the shared memory.
+# Chunks shorter than the shortest motif are not scanned, no motif can start there.
+# Returns {record name: {(motif, strand): [1-based positions within the record]}}, record names have to be unique
+def find_motifs_parallel(records, motifs: list, both_strands: bool = True,
+                         workers: int = None, chunk_size: int = 1 << 22, total: int = None) -> dict:
+    motifs = [motif.upper() for motif in motifs]
+    overlap = max((len(motif) for motif in motifs), default=1) - 1
+    shortest = min((len(motif) for motif in motifs), default=1)
+    if total is None:
+        records = list(records)
+        total = sum(len(sequence) for _, sequence in records)
+    shared = SharedMemory(create=True, size=max(total, 1))
+    try:
+        tasks = []
+        names = [] # record names in file order
+        seen = set()
+        record_starts = [] # where every record begins in the shared block
+        offset = 0
+        for record, (name, sequence) in enumerate(records):
+            if name in seen: # results are collected per name
+                raise ValueError(f"Record name '{name}' is used more than once, its hits would be mixed")
+            seen.add(name)
+            if offset + len(sequence) > total:
+                raise ValueError(f"The records have more than the {total} bases given as total")
+            names.append(name)
+            record_starts.append(offset)
+            shared.buf[offset:offset + len(sequence)] = sequence.encode("ascii", "replace")
+            record_end = offset + len(sequence)
+            for start in range(offset, record_end, chunk_size):
+                end = min(start + chunk_size, record_end)
+                read_end = min(end + overlap, record_end)
+                if read_end - start >= shortest:
+                    tasks.append((record, start, end, read_end, motifs, both_strands))
+            offset = record_end
+
+        keys = [(motif, strand) for motif in motifs for strand in (("+", "-") if both_strands else ("+",))]
+        results = {name: {key: [] for key in keys} for name in names}
+        with Pool(workers, initializer=_attach_shared, initargs=(shared.name,)) as pool:
+            for record, start, hits in pool.imap(_scan_chunk, tasks): # imap keeps the chunk order
+                name = names[record]
+                shift = start - record_starts[record] # chunk position inside its record
+                for key, motif_positions in hits.items():
+                    results[name][key].extend(position + shift for position in motif_positions)
+        return results
+    finally:
+        shared.close()
+        shared.unlink()
+
+# Defining function for plot. With many hits one bar per hit is too slow (millions of artists),
+# so then the hits are counted into one bin per pixel column with np.histogram and drawn as one
+# rasterized step track. The number of bins follows the figure width, so the time stays the same
+# for any number of hits. density=None picks the mode automatically
+def plot_positions(positions: list, motif: str, density: bool = None, sequence_length: int = None):
+    fig = plt.figure(figsize=(8, 4))
+    if density is None:
+        density = len(positions) > 10000
+    if density:
+        n_bins = int(fig.get_figwidth() * fig.dpi) # one bin per pixel column
+        end = sequence_length or max(positions)
+        counts, edges = np.histogram(positions, bins=n_bins, range=(1, end + 1))
+        plt.stairs(counts, edges, fill=True, color="teal", rasterized=True)
+        plt.ylabel("Occurrences per bin")
+    else:
+        plt.bar(positions, [1]*len(positions), color="teal")
+        plt.ylabel("Occurrence")
     plt.title(f'Occurrences of Motif "{motif}"') # takes user input for motif into title
     plt.xlabel("Position in Sequence")
-    plt.ylabel("Occurrence")
     plt.savefig("2b_output_ArianeNeumann.png") # saving plot to user output folder
     plt.show()
 
 # ================= Calling the functions =================
 
-# User input required for sequence
-input_file = input("Enter file path for sequence here: ")
-sequence = read_sequence(input_file)
-
-# User input required for motif
-motif = input("What motif should we look for?: ")
-positions = find_motif(sequence, motif)
-
-# Will print all found positions of motif within sequence to screen (no user input required this time)
-print(f"Motif positions: {positions}")
-if positions:
-    plot_positions(positions, motif)
-else:
-    print("No occurrences of the motif found.")
-plot_positions(positions, motif)
+if __name__ == "__main__":
+    # User input required for sequence
+    input_file = input("Enter file path for sequence here: ")
+
+    # Every record can be scanned on its own, spread over all cores
+    if input("Scan each record separately on all cores? (yes/no): ").strip().lower() == "yes":
+        motifs = [motif.strip().upper() for motif in input("What motif(s) should we look for?: ").split(",") if motif.strip()]
+        both_strands = input("Search the reverse complement as well? (yes/no): ").strip().lower() == "yes"
+        try: # records are read one at a time straight into the shared memory
+            results = find_motifs_parallel(read_records(input_file), motifs, both_strands, total=total_length(input_file))
+        except ValueError as e:
+            print(f"Error: {e}")
+            raise SystemExit(1)
+        for name, hits in results.items():
+            for (motif, strand), motif_positions in hits.items():
+                print(f"{name}: motif {motif} ({strand} strand) positions: {motif_positions}")
+        raise SystemExit(0)
+
+    # With an index the genome is only read once, later runs open the saved index instead
+    use_index = input("Use a saved motif index (built if missing or outdated)? (yes/no): ").strip().lower() == "yes"
+    if use_index:
+        index = load_motif_index(input_file)
+        sequence = None
+    else:
+        index = None
+        sequence = read_sequence(input_file)
+
+    # User input required for motif. Several motifs can be given separated by comma, IUPAC codes (e.g. TATAWAW) are allowed
+    motifs = [motif.strip().upper() for motif in input("What motif(s) should we look for?: ").split(",") if motif.strip()]
+    both_strands = input("Search the reverse complement as well? (yes/no): ").strip().lower() == "yes"
+    max_mismatches = int(input("How many mismatches are allowed? (0 for exact matches): ") or 0)
+
+    if max_mismatches > 0: # approximate search, reports (position, mismatches)
+        if sequence is None:
+            sequence = index["sequence"].tobytes().decode("ascii")
+        approx_hits = {}
+        for motif in motifs:
+            approx_hits[(motif, "+")] = find_motif_approx(sequence, motif, max_mismatches)
+            if both_strands:
+                approx_hits[(motif, "-")] = find_motif_approx(sequence, reverse_complement(motif), max_mismatches)
+        for (motif, strand), motif_hits in approx_hits.items():
+            print(f"Motif {motif} ({strand} strand) positions and mismatches: {motif_hits}")
+        hits = {key: [position for position, _ in motif_hits] for key, motif_hits in approx_hits.items()}
+    else:
+        hits = find_motifs(sequence, motifs, both_strands, index)
+
+        # Will print all found positions of motif within sequence to screen (no user input required this time)
+        for (motif, strand), motif_positions in hits.items():
+            print(f"Motif {motif} ({strand} strand) positions: {motif_positions}")
+    positions = sorted(position for motif_positions in hits.values() for position in motif_positions)
+    if positions:
+        sequence_length = len(sequence) if sequence is not None else len(index["sequence"])
+        plot_positions(positions, ", ".join(motifs), sequence_length=sequence_length)
+    else:
+        print("No occurrences of the motif found.")
@@ -12,7 +12,9 @@ Description:
     before starting the code. 
         
 User defined functions: 
-    read_txt, count_amino_acids, get_count, sort_counts
+    read_txt, count_amino_acids, count_fasta, counts_to_dict, get_count, sort_counts, write_counts,
+    shard_ranges, count_shard, merge_counts, count_parallel, codon_to_aa_matrix, count_translated,
+    dipeptide_counts, isoelectric_points, protein_features, write_features
 
 Procedure:
     1. Preparation of the script
@@ -28,6 +30,13 @@ Output:
     
 Usage: 
     python3 aa_count.py amino.faa counted_aa.txt
+    python3 aa_count.py amino.faa counted_aa.txt parallel [workers]         (shards counted on all cores)
+    python3 aa_count.py amino.faa part_0.npy shard 0 10                      (shard 0 of 10, e.g. as a cluster job)
+    python3 aa_count.py - counted_aa.txt merge part_0.npy ... part_9.npy     (adding up the partial counts)
+    python3 aa_count.py DNA_seq.fasta counted_aa.txt fused [table_id] [codons|proteins]
+                                         (translating DNA and counting in one pass, no amino.faa needed)
+    python3 aa_count.py amino.faa features.npz features
+                                         (composition, dipeptides, molecular weight, pI and GRAVY per protein)
 
 Version: 1.0
 Date 2025-10-18
@@ -37,39 +46,22 @@ Author: Ariane Neumann
 
 import sys
 import os
-from collections import Counter # to use a counter, it first needs to be imported
+from multiprocessing import Pool
+import numpy as np # counting is done on arrays now instead of Counter objects
+import dna2protein # for the fused translate-and-count mode
+import seq_parser
 
-# Setting the arguments for my code. I use the output file from the previous section (dna2protein) as input file here
-sys.argv = ["aa_count.py", "amino.faa", "counted_aa.txt"]
+# Column order of the count matrix: the 20 amino acids and "X" for everything else
+AA_COLUMNS = "ACDEFGHIKLMNPQRSTVWY" + "X"
+STOP_COLUMN = len(AA_COLUMNS) # "*" gets its own column, which is removed after counting
 
-try:
-    if len(sys.argv) >= 3:
-        aa_input = sys.argv[1]
-        counted_aa = sys.argv[2]
-    else:
-        print("Please enter file path")
-
-# Validate input file
-    if not os.path.exists(aa_input):
-        print(f"Error: '{aa_input}' does not exist.")
-        sys.exit(1)
-    if not os.path.isfile(aa_input):
-        print(f"Error: '{aa_input}' is not a file.")
-        sys.exit(1)
-        if not aa_input.lower().endswith('.txt'):
-            print(f"Warning: '{aa_input}' is NOT a text file.")
-
-# Validate output path
-    output_dir = os.path.dirname(counted_aa)
-    if output_dir and not os.path.exists(output_dir):
-        print(f"Error: '{output_dir}' does not exist.")
-        sys.exit(1)
-except Exception as e:
-    print(f"Error for input:{e}")
-    sys.exit(1)
-    
-# Now I create a set for the amino acids 
-amino_acids = set("QRIKLMNACDYEPVWSTFGH")
+# Lookup table from a letter (byte) to its column, every unknown letter goes to "X".
+# uint8 is enough for 22 columns, so the column array of a batch takes one byte per residue
+AA_INDEX = np.full(256, AA_COLUMNS.index("X"), dtype=np.uint8)
+for column, aa in enumerate(AA_COLUMNS[:-1]):
+    AA_INDEX[ord(aa)] = column
+AA_INDEX[ord("*")] = STOP_COLUMN
+BATCH_RESIDUES = 1 << 22 # residues counted together with one np.bincount
 
 #------------------------------------------------------------------------------
 
@@ -78,24 +70,12 @@ def read_txt(file_path):
     try:
         sequences = [] # creating an empty list for the sequences I will look at 
         headers = []
-        
-        with open(file_path, 'r') as a: # open in "read" mode
-            current_seq = ''# giving an empty string to the current sequence as placeholder
-            current_header = ''
-            for line in a: # looking into the file
-                line = line.strip() # remove whitespace in beginning and end of sequence
-                
-                if line.startswith(">"): # to make sure that I only consider a sequence when it starts with ">"
-                    if current_seq:
-                        sequences.append(current_seq) # While still in the FOR loop, I will only append to the current sequence. Once I jump out of the loop, and iterate to the next sequence, I will stop added this that sequence and move to the next one
-                        current_seq = ''
-                    current_header = line[1:] # removes ">" from the header line
-                    
-                else:
-                    current_seq += line.upper() # check to have all letters in capital
-            if current_seq:
-                sequences.append(current_seq) # after FOR loop, add last sequence
-                headers.append(current_header)
+
+        # seq_parser reads the file in big blocks and gives back one record at a time
+        for header, sequence in seq_parser.read_fasta_records(file_path):
+            if sequence: # only records that really have a sequence are counted
+                sequences.append(sequence.upper().decode("ascii", "replace")) # check to have all letters in capital
+                headers.append(header.decode() if header is not None else '') # header belonging to this sequence, so rows and headers stay together
 
         return sequences, headers # returns the former empty list "sequences" without printing to screen
     
@@ -104,30 +84,90 @@ def read_txt(file_path):
         sys.exit(1)
 #------------------------------------------------------------------------------
 
-# Defining function to count the amino acids
+# Defining function cutting sequences (str or bytes) into batches of about batch_residues letters,
+# so only one batch at a time is joined and turned into arrays
+def _batches(sequences, batch_residues=BATCH_RESIDUES):
+    batch, size = [], 0
+    for sequence in sequences:
+        batch.append(sequence.encode("ascii", "replace") if isinstance(sequence, str) else sequence)
+        size += len(sequence) + 1 # + 1 so that also empty sequences fill a batch
+        if size >= batch_residues:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+# Defining function giving the sequence number (int32) and the column (uint8) of every letter of a batch
+def _batch_columns(batch):
+    lengths = np.fromiter(map(len, batch), dtype=np.int64, count=len(batch))
+    columns = AA_INDEX[np.frombuffer(b"".join(batch), dtype=np.uint8)]
+    rows = np.repeat(np.arange(len(batch), dtype=np.int32), lengths)
+    return rows, columns
+
+# Defining function counting one batch: one np.bincount over (sequence number * columns + column)
+# fills the count rows of all sequences of the batch at once, "*" is counted in an extra column and removed
+def _count_batch(batch):
+    rows, columns = _batch_columns(batch)
+    width = len(AA_COLUMNS) + 1 # + stop column
+    counts = np.bincount(rows * width + columns, minlength=len(batch) * width)
+    return counts.reshape(len(batch), width)[:, :STOP_COLUMN]
+
+# Defining function to count the amino acids into an N x 21 matrix (preallocated, rows are the sequences,
+# columns are AA_COLUMNS: 20 amino acids + X, "*" is not counted). The sequences are counted batch by batch,
+# so the temporary arrays stay at BATCH_RESIDUES letters. The total counts are the column sums of the matrix
 def count_amino_acids(sequences):
     try: 
-        per_sequence_counts = [] # creating an empty list for counting aa per sequence storing individual counter
-        total_counts = Counter() # while it would be more intuitiv to start with this before "per_seq", it might mix up the counts from the individual sequences.
-    
-        for seq in sequences: # starting the FOR loop
-            seq_counter = Counter() # counting within one loop iteration
-        
-            for aa in seq: # one more level in, counting within the sequence
-                if aa == '*' :
-                    continue
-                
-                if aa in amino_acids: # if it is a standard aa, add 1
-                    seq_counter[aa] += 1
-                    total_counts[aa] += 1
-                else:
-                    seq_counter['X'] += 1 # even if it is an unknown aa, count 1
-                    total_counts['X'] += 1
-                    per_sequence_counts.append(seq_counter) # append or add all counted aa for the current sequence
-    
+        per_sequence_counts = np.zeros((len(sequences), len(AA_COLUMNS)), dtype=np.int64)
+        row = 0
+        for batch in _batches(sequences):
+            per_sequence_counts[row:row + len(batch)] = _count_batch(batch)
+            row += len(batch)
+        total_counts = per_sequence_counts.sum(axis=0)
         return per_sequence_counts, total_counts 
     except Exception as e:
         print(f" Warning: Cannot count aa: {e}")
+
+# Defining function making the matrix bigger when more records come than rows were made (doubling)
+def _grow(matrix, rows):
+    if rows <= len(matrix):
+        return matrix
+    bigger = np.zeros((max(rows, 2 * len(matrix)), matrix.shape[1]), dtype=matrix.dtype)
+    bigger[:len(matrix)] = matrix
+    return bigger
+
+# Defining function counting a fasta file straight from seq_parser, without keeping the sequences:
+# records are collected into batches, counted and dropped. Like read_txt only records with a sequence
+# are counted. Returns headers, per sequence count matrix (N x 21) and total counts, and with
+# dipeptides=True also the N x 400 dipeptide matrix (see dipeptide_counts)
+def count_fasta(file_path, dipeptides=False):
+    headers = []
+    def records(): # sequences in capital letters, headers are collected on the way
+        for header, sequence in seq_parser.read_fasta_records(file_path):
+            if sequence:
+                headers.append(header.decode() if header is not None else '')
+                yield sequence.upper()
+    per_sequence_counts = np.zeros((1024, len(AA_COLUMNS)), dtype=np.int64)
+    pair_counts = np.zeros((1024 if dipeptides else 0, 400), dtype=np.int32)
+    row = 0
+    try:
+        for batch in _batches(records()):
+            per_sequence_counts = _grow(per_sequence_counts, row + len(batch))
+            per_sequence_counts[row:row + len(batch)] = _count_batch(batch)
+            if dipeptides:
+                pair_counts = _grow(pair_counts, row + len(batch))
+                pair_counts[row:row + len(batch)] = _dipeptide_batch(batch)
+            row += len(batch)
+    except Exception as e:
+        print(f"Error: cannot reader fasta file: {e}")
+        sys.exit(1)
+    per_sequence_counts = per_sequence_counts[:row]
+    if dipeptides:
+        return headers, per_sequence_counts, per_sequence_counts.sum(axis=0), pair_counts[:row]
+    return headers, per_sequence_counts, per_sequence_counts.sum(axis=0)
+
+# Defining function turning one row of counts into a dictionary {amino acid: count}, leaving out zeros
+def counts_to_dict(counts):
+    return {aa: int(count) for aa, count in zip(AA_COLUMNS, counts) if count}
 #------------------------------------------------------------------------------
 
 # Defining function to count each amino_acid/count pair
@@ -138,29 +178,271 @@ def get_count(pair): # this needs to be defined before I can use "get_count" in
 def sort_counts(counts):
     return sorted(counts.items(), key=get_count, reverse=True)
 
+# Defining function to write the output file: total counts sorted by abundance, then (if given) the
+# per sequence counts as a table, one row per sequence and one column per amino acid
+def write_counts(output_file, total_counts, headers=None, per_seq_counts=None):
+    output_lines = ["# Total amino acid counts (sorted by abundance):"]
+    for aa, count in sort_counts(counts_to_dict(total_counts)):
+        output_lines.append(f"{aa}\t{count}")
+    if per_seq_counts is not None:
+        output_lines.append("# Amino acid counts per sequence:")
+        output_lines.append("header\t" + "\t".join(AA_COLUMNS))
+        for header, counts in zip(headers, per_seq_counts.tolist()):
+            output_lines.append(header + "\t" + "\t".join(map(str, counts)))
+
+    # Open with in "write" mode, saving the output into the text file
+    with open(output_file, 'w') as out:
+        out.write('\n'.join(output_lines) + '\n')
+
 #------------------------------------------------------------------------------
 
-# Calling the functions and counting the amino acids
-sequences,headers = read_txt(aa_input) # reading the input file
-per_seq_counts, total_counts = count_amino_acids(sequences) # counting the amino acids
-sorted_total = sort_counts(total_counts) # sorting the amino acids
+# Defining function to split a fasta file into byte ranges for shards. Every range starts at a ">"
+# at the beginning of a line, so no record is cut in two. Returns a list of shards (start, end) pairs,
+# a shard can be empty when the file has fewer records than shards.
+# Byte ranges only work on uncompressed files, a gzip file has to be counted in count mode
+def shard_ranges(file_path, shards):
+    if seq_parser.is_compressed(file_path):
+        raise ValueError(f"'{file_path}' is gzip compressed and cannot be split into shards, use count mode")
+    size = os.path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, 'rb') as a:
+        for i in range(1, shards):
+            position = max(size * i // shards - 1, boundaries[-1]) # -1 so a ">" right at the cut is found too
+            a.seek(position)
+            while True: # reading forward until the next "\n>" (start of the next record)
+                block = a.read(1 << 16)
+                found = block.find(b"\n>")
+                if found >= 0:
+                    boundaries.append(position + found + 1)
+                    break
+                if len(block) < (1 << 16):
+                    boundaries.append(size) # no record start left
+                    break
+                position += len(block) - 1 # "\n" could be the last byte of the block
+                a.seek(position)
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+# Defining function counting one shard (byte range) of a fasta file. Returns the partial count array
+# (21 columns, same as a row of the count matrix). Partial arrays can simply be added up.
+# seq_parser reads the range block by block, so a shard is never in memory as a whole
+def count_shard(file_path, start, end):
+    counts = np.zeros(STOP_COLUMN + 1, dtype=np.int64)
+    for _, _, chunk in seq_parser.read_fasta_chunks(file_path, start=start, end=end):
+        counts += np.bincount(AA_INDEX[np.frombuffer(chunk.upper(), dtype=np.uint8)], minlength=STOP_COLUMN + 1)
+    return counts[:STOP_COLUMN]
 
-# This will be in the output file "count_out", starting with the total aa sorted and then adding the per sequence sorted.
-output_lines = ["# Total amino acid counts (sorted by abundance):"]
-for aa, count in sorted_total:
-    output_lines.append(f"{aa}\t{count}")
+# Defining function merging partial count arrays (from processes or from separate jobs) by addition
+def merge_counts(partials):
+    total = np.zeros(len(AA_COLUMNS), dtype=np.int64)
+    for partial in partials:
+        total += partial
+    return total
 
-# Open with in "write" mode, saving the output into the text file
-with open(counted_aa, 'w') as out:
-    out.write('\n'.join(output_lines) + '\n')
+# Defining function for the worker processes
+def _count_shard(task):
+    return count_shard(*task)
+
+# Defining function counting a whole file in shards on several processes
+def count_parallel(file_path, workers=None, shards=None):
+    workers = workers or os.cpu_count()
+    ranges = shard_ranges(file_path, shards or workers * 4)
+    with Pool(workers) as pool:
+        return merge_counts(pool.imap_unordered(_count_shard, [(file_path, start, end) for start, end in ranges]))
+
+#------------------------------------------------------------------------------
+
+# Defining function for the matrix from codon numbers (0-64, see dna2protein.codon_indices) to count columns.
+# Row c has a 1 in the column of the amino acid of codon c, stop codons have an empty row (not counted)
+def codon_to_aa_matrix(table_id=1):
+    codons = dna2protein.GENETIC_CODES[table_id]["codons"]
+    matrix = np.zeros((len(codons), len(AA_COLUMNS)), dtype=np.int64)
+    for codon, aa in enumerate(codons.tolist()):
+        if AA_INDEX[aa] != STOP_COLUMN:
+            matrix[codon, AA_INDEX[aa]] = 1
+    return matrix
+
+# Defining function counting amino acids straight from a DNA fasta file (frame +1, coding strand), without
+# writing the proteins to a file and reading them again. Records are streamed one by one.
+# via_codons=True does not even build the protein strings: the codon numbers of every record are counted
+# (65 possible) and mapped to amino acids with one matrix product.
+# Returns headers, per sequence count matrix (N x 21) and total counts, like count_amino_acids
+def count_translated(dna_file, table_id=1, via_codons=True):
+    headers = []
+    rows = []
+    if via_codons:
+        mapping = codon_to_aa_matrix(table_id)
+        for seq_id, dna_seq in dna2protein.iter_fasta(dna_file):
+            codon_counts = np.bincount(dna2protein.codon_indices(dna_seq), minlength=len(mapping))
+            headers.append(seq_id)
+            rows.append(codon_counts @ mapping)
+    else:
+        for seq_id, protein_seq, _ in dna2protein.translate_records(dna2protein.iter_fasta(dna_file), True, table_id):
+            headers.append(seq_id)
+            rows.append(count_amino_acids([protein_seq])[0][0])
+    per_seq_counts = np.array(rows, dtype=np.int64).reshape(len(rows), len(AA_COLUMNS))
+    return headers, per_seq_counts, per_seq_counts.sum(axis=0)
 
 #------------------------------------------------------------------------------
+
+# Values per amino acid, in the order of AA_COLUMNS (without "X"). "X" is left out of weight, GRAVY and pI
+# Average residue masses in Dalton (amino acid minus water)
+RESIDUE_MASS = np.array([71.0788, 103.1388, 115.0886, 129.1155, 147.1766, 57.0519, 137.1411, 113.1594, 128.1741, 113.1594,
+                         131.1926, 114.1038, 97.1167, 128.1307, 156.1875, 87.0782, 101.1051, 99.1326, 186.2132, 163.1760])
+WATER_MASS = 18.01528
+# Kyte-Doolittle hydropathy
+HYDROPATHY = np.array([1.8, 2.5, -3.5, -3.5, 2.8, -0.4, -3.2, 4.5, -3.9, 3.8,
+                       1.9, -3.5, -1.6, -3.5, -4.5, -0.8, -0.7, 4.2, -0.9, -1.3])
+# pKa values (EMBOSS) of the charged side chains and of the two ends
+POSITIVE_PKA = {"K": 10.8, "R": 12.5, "H": 6.5}
+NEGATIVE_PKA = {"D": 3.9, "E": 4.1, "C": 8.5, "Y": 10.1}
+N_TERM_PKA, C_TERM_PKA = 8.6, 3.6
+
+# Defining function counting the 400 dipeptides (pairs of neighbouring standard amino acids) of one batch.
+# Column a*20+b is the pair AA_COLUMNS[a] followed by AA_COLUMNS[b]; pairs with X or "*" are not counted.
+# Like _count_batch, all sequences of the batch are done with one np.bincount
+def _dipeptide_batch(batch):
+    rows, columns = _batch_columns(batch)
+    first, second = columns[:-1], columns[1:]
+    valid = (first < 20) & (second < 20) & (rows[:-1] == rows[1:]) # no pair across two sequences
+    pairs = rows[:-1][valid] * 400 + first[valid].astype(np.int32) * 20 + second[valid]
+    return np.bincount(pairs, minlength=len(batch) * 400).reshape(len(batch), 400)
+
+# Defining function for the dipeptide counts of all sequences, N x 400 (int32), counted batch by batch
+def dipeptide_counts(sequences):
+    pair_counts = np.zeros((len(sequences), 400), dtype=np.int32)
+    row = 0
+    for batch in _batches(sequences):
+        pair_counts[row:row + len(batch)] = _dipeptide_batch(batch)
+        row += len(batch)
+    return pair_counts
+
+# Defining function for the isoelectric point of all proteins at once: the net charge goes down with the pH,
+# so the pH with charge 0 is found by bisection, done for every protein (row) at the same time
+def isoelectric_points(per_seq_counts, iterations=30):
+    positive = np.stack([per_seq_counts[:, AA_COLUMNS.index(aa)] for aa in POSITIVE_PKA], axis=1)
+    negative = np.stack([per_seq_counts[:, AA_COLUMNS.index(aa)] for aa in NEGATIVE_PKA], axis=1)
+    positive_pka = np.array(list(POSITIVE_PKA.values()))
+    negative_pka = np.array(list(NEGATIVE_PKA.values()))
+    low = np.zeros(len(per_seq_counts))
+    high = np.full(len(per_seq_counts), 14.0)
+    for _ in range(iterations):
+        ph = (low + high) / 2
+        charge = (1 / (1 + 10 ** (ph - N_TERM_PKA))
+                  + (positive / (1 + 10 ** (ph[:, None] - positive_pka))).sum(axis=1)
+                  - 1 / (1 + 10 ** (C_TERM_PKA - ph))
+                  - (negative / (1 + 10 ** (negative_pka - ph[:, None]))).sum(axis=1))
+        low = np.where(charge > 0, ph, low)   # still positive: pI is higher
+        high = np.where(charge > 0, high, ph)
+    return (low + high) / 2
+
+# Defining function building the feature table from the count matrix and the dipeptide counts with matrix
+# operations only. Returns {column name: array with one value per sequence}
+def protein_features(per_seq_counts, dipeptides):
+    standard = per_seq_counts[:, :20]
+    length = per_seq_counts.sum(axis=1)
+    standard_length = standard.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"): # empty sequences give 0 instead of a warning
+        features = {
+            "length": length,
+            "molecular_weight": np.where(standard_length > 0, standard @ RESIDUE_MASS + WATER_MASS, 0.0),
+            "isoelectric_point": isoelectric_points(per_seq_counts),
+            "gravy": np.nan_to_num(standard @ HYDROPATHY / standard_length),
+        }
+        composition = np.nan_to_num(per_seq_counts / length[:, None])
+        pair_totals = dipeptides.sum(axis=1, keepdims=True)
+        # float32 is enough for frequencies and halves the biggest array (N x 400)
+        pair_frequency = np.divide(dipeptides, pair_totals, out=np.zeros(dipeptides.shape, dtype=np.float32),
+                                   where=pair_totals > 0)
+    for column, aa in enumerate(AA_COLUMNS):
+        features[f"freq_{aa}"] = composition[:, column]
+    for column in range(400):
+        features[f"dipeptide_{AA_COLUMNS[column // 20]}{AA_COLUMNS[column % 20]}"] = pair_frequency[:, column]
+    return features
+
+# Defining function writing the features column by column into one .npz file (one array per column,
+# plus "header"), so a single column can be loaded without reading the others: np.load(file)["gravy"]
+def write_features(output_file, headers, features):
+    np.savez(output_file, header=np.array(headers), **features)
+
 #------------------------------------------------------------------------------
 
-# Optional: In case I want to see the output printed on screen
-show_output = input("Do you want to print the contents of the output file to screen? (yes/no): ").strip().lower()
-if show_output == 'yes':
-    with open(counted_aa, 'r') as out:  # Use the correct variable name here
-        print("\n--- Output File Content ---")
-        print(out.read())
+if __name__ == "__main__":
+    # Setting the arguments for my code. I use the output file from the previous section (dna2protein) as input file here
+    if len(sys.argv) < 3:
+        sys.argv = ["aa_count.py", "amino.faa", "counted_aa.txt"]
+
+    try:
+        if len(sys.argv) >= 3:
+            aa_input = sys.argv[1]
+            counted_aa = sys.argv[2]
+        else:
+            print("Please enter file path")
+
+        # Optional mode: count (default), parallel [workers], shard <number> <count>, merge <partial.npy> ...
+        mode = sys.argv[3] if len(sys.argv) > 3 else "count"
+        workers = int(sys.argv[4]) if mode == "parallel" and len(sys.argv) > 4 else None
+        if mode == "shard":
+            shard_number, shard_count = int(sys.argv[4]), int(sys.argv[5])
+        if mode == "fused": # input is a DNA fasta file, translated and counted in one go
+            table_id = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+            via_codons = (sys.argv[5] if len(sys.argv) > 5 else "codons") == "codons"
+        if mode == "features" and not counted_aa.endswith(".npz"):
+            counted_aa += ".npz" # column file, see write_features
+        if mode == "merge":
+            partial_files = sys.argv[4:]
+            aa_input = partial_files[0] # checked below like an input file
+
+    # Validate input file
+        if not os.path.exists(aa_input):
+            print(f"Error: '{aa_input}' does not exist.")
+            sys.exit(1)
+        if not os.path.isfile(aa_input):
+            print(f"Error: '{aa_input}' is not a file.")
+            sys.exit(1)
+            if not aa_input.lower().endswith('.txt'):
+                print(f"Warning: '{aa_input}' is NOT a text file.")
+
+    # Validate output path
+        output_dir = os.path.dirname(counted_aa)
+        if output_dir and not os.path.exists(output_dir):
+            print(f"Error: '{output_dir}' does not exist.")
+            sys.exit(1)
+    except Exception as e:
+        print(f"Error for input:{e}")
+        sys.exit(1)
+
+    # Calling the functions and counting the amino acids
+    if mode in ("parallel", "shard") and seq_parser.is_compressed(aa_input):
+        print(f"Error: '{aa_input}' is gzip compressed and cannot be split into shards, use count mode.")
+        sys.exit(1)
+    if mode == "parallel": # whole file in shards on all cores, totals only
+        write_counts(counted_aa, count_parallel(aa_input, workers))
+    elif mode == "shard": # one shard for a separate job, the partial counts are saved as .npy
+        start, end = shard_ranges(aa_input, shard_count)[shard_number]
+        np.save(counted_aa, count_shard(aa_input, start, end))
+        print(f"Partial counts of shard {shard_number} written to {counted_aa}")
+        sys.exit(0)
+    elif mode == "fused":
+        headers, per_seq_counts, total_counts = count_translated(aa_input, table_id, via_codons)
+        write_counts(counted_aa, total_counts, headers, per_seq_counts)
+    elif mode == "features": # composition, dipeptides, weight, pI and GRAVY per protein
+        headers, per_seq_counts, total_counts, dipeptides = count_fasta(aa_input, dipeptides=True)
+        write_features(counted_aa, headers, protein_features(per_seq_counts, dipeptides))
+        print(f"Features of {len(headers)} proteins written to {counted_aa}")
+        sys.exit(0)
+    elif mode == "merge": # adding up the partial counts of all shards
+        write_counts(counted_aa, merge_counts(np.load(partial) for partial in partial_files))
+    else:
+        headers, per_seq_counts, total_counts = count_fasta(aa_input) # reading and counting the amino acids batch by batch
+        write_counts(counted_aa, total_counts, headers, per_seq_counts) # sorted totals and the per sequence table
+
+    #------------------------------------------------------------------------------
+    #------------------------------------------------------------------------------
 
+    # Optional: In case I want to see the output printed on screen
+    show_output = input("Do you want to print the contents of the output file to screen? (yes/no): ").strip().lower()
+    if show_output == 'yes':
+        with open(counted_aa, 'r') as out:  # Use the correct variable name here
+            print("\n--- Output File Content ---")
+            print(out.read())
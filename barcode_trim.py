@@ -12,9 +12,30 @@ Description:
     in separate output files. In case no barcode pattern is found in a sequence,
     this sequence should be stored separately as well. The outcome should be 4 
     output files from 1 input file.
+    The barcodes and their output files are read from a sample sheet, so runs with
+    96 or 384 barcodes work the same way. All barcodes are put into a dictionary
+    once (grouped by length), and every read is then assigned by looking up its
+    first and its last bases, instead of comparing it with every barcode.
+    Optionally reads with 1 (or 2) sequencing errors in the barcode are corrected:
+    all sequences with 1 or 2 mismatches to a barcode are put into the same
+    dictionary beforehand, so a corrected read costs the same lookups as an exact one.
+    Sequences close to more than one barcode are left out, so no read is assigned
+    to the wrong sample.
+    The reads are collected per sample in memory and written in large blocks. Only a
+    limited number of output files is open at the same time (the least recently used
+    one is closed when another is needed), so hundreds of samples do not run into the
+    open file limit.
+    With more than one worker the fastq file is cut into blocks of whole records, the
+    blocks are sorted and trimmed on several cores and the results are written in the
+    order of the blocks, so the output files are exactly the same as with one worker.
+    The input can be gzip compressed (e.g. barcode.fastq.gz), and the outputs can be
+    written as gzip or as BGZF (blocked gzip, readable by samtools/htslib). The
+    compression runs on several threads, zlib releases the GIL while it compresses.
         
 User defined functions: 
-    trim_barcode, process_fastq
+    read_sample_sheet, barcode_neighbors, build_barcode_lookup, trim_barcode, gzip_member, bgzf_blocks,
+    open_sample_writer, write_records, flush_sample_writer, close_sample_writer,
+    demultiplex_block, demultiplex_blocks, process_fastq
 
 Procedure:
     1. Preparation of the script
@@ -23,13 +44,15 @@ Procedure:
     4. Write to output file
  
 Input:
-    text file "barcode.fastq"
+    text file "barcode.fastq" (or gzip compressed "barcode.fastq.gz")
+    sample sheet "barcode_samplesheet.tsv" (barcode and output file per line, tab or comma separated)
  
 Output:
     text file "trimmed_DNA.txt"
+    (one fastq file per sample plus undetermined, with ".gz" at the end when compressed)
     
 Usage: 
-    python3 barcode_trim.py barcode.fastq trimmed_DNA.txt
+    python3 barcode_trim.py barcode.fastq trimmed_DNA.txt [sample_sheet] [max_mismatches 0|1|2] [workers] [none|gzip|bgzf]
 
 Version: 1.0
 Date 2025-10-18
@@ -39,125 +62,337 @@ Author: Ariane Neumann
 
 import sys
 import os
+import zlib
+import struct
+from collections import OrderedDict
+from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations, product
+import seq_parser
 
-# Setting the arguments for my code. I use the output file from the previous section (dna2protein) as input file here
-sys.argv = ["barcode_trim.py", "barcode.fastq", "trimmed_DNA.txt"]
-
-barcode_in = sys.argv[1]
-trimmed = sys.argv[2]
-
-# Validate input file
-if not os.path.exists(barcode_in):
-    print(f"Error: '{barcode_in}' does not exist.")
-    sys.exit(1)
-if not os.path.isfile(barcode_in):
-    print(f"Error: '{barcode_in}' is not a file.")
-    sys.exit(1)
-if not barcode_in.lower().endswith('.fastq'):
-    print(f"Warning: '{barcode_in}' is NOT a fastq file.")
-
-# Validate output path
-output_dir = os.path.dirname(trimmed)
-if output_dir and not os.path.exists(output_dir):
-    print(f"Error: '{output_dir}' does not exist.")
-    sys.exit(1)
-   
-# Making a dictionary for the barcodes according to the pdf file
-barcodes = {
-    "TATCCTCT": "sample1.fastq",
-    "GTAAGGAG": "sample2.fastq",
-    "TCTCTCCG": "sample3.fastq"
-}
 undetermined_file = "undetermined.fastq" # when no barcode is found, this should be saved in a separate file
+default_sample_sheet = "barcode_samplesheet.tsv" # barcodes according to the pdf file, one line per sample
+BUFFER_SIZE = 1 << 26 # 64 MB of reads are collected in memory before they are written
+MAX_OPEN_FILES = 128 # stays well below the usual limit of 1024 open files
+COMPRESS_LEVEL = 6 # same default as gzip -6 and bgzip
+BGZF_BLOCK = 65280 # bytes of data per BGZF block, the compressed block has to stay below 64 kB
+COMPRESS_PIECE = 16 * BGZF_BLOCK # data compressed by one thread at a time
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff" # no file name, time 0, so the same reads give the same file
+BGZF_HEADER = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00" # gzip header with the "BC" extra field
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000") # empty block marking the end
+IUPAC_LETTERS = "ACGTUNRYSWKMBDHV" # nucleotide letters, a first column made only of these is a barcode and not a header
 
 #------------------------------------------------------------------------------
 
-# Defining the function for the barcode trimming 
-def trim_barcode(seq, qual, barcode): 
-    if seq.startswith(barcode): # check if sequence starts with barcode or ....
-        return seq[len(barcode):], qual[len(barcode):]
-    elif seq.endswith(barcode): # check if sequence ends with barcode. Better to check in both places even though it should only be in the end
-        return seq[:-len(barcode)], qual[:-len(barcode)]
-    else:
-        return None, None  # if no barcode was found and the sequence is undetermined 
+# Defining function to read the sample sheet. Every line has a barcode and the output file name,
+# separated by tab or comma. Empty lines, lines starting with "#" and a header line are skipped.
+# Returns a dictionary barcode -> output file, in the order of the sheet
+def read_sample_sheet(sheet_file):
+    barcodes = {}
+    first_line = True # first line that is not empty or a comment, the only one that can be a header
+    with open(sheet_file, 'r') as a:
+        for line_number, line in enumerate(a, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            header_line, first_line = first_line, False
+            columns = [column.strip() for column in line.replace(',', '\t').split('\t')]
+            barcode = columns[0].upper()
+            if len(columns) < 2 or not columns[1]:
+                raise ValueError(f"Line {line_number} of '{sheet_file}' needs a barcode and an output file")
+            if not barcode or set(barcode) - set("ACGT"):
+                # only a first line with a word like "barcode" is the header. A first column made only of
+                # nucleotide letters (e.g. TATCCTCN) is a wrong barcode, not a header, and is reported
+                if header_line and set(barcode) - set(IUPAC_LETTERS):
+                    continue
+                raise ValueError(f"Line {line_number} of '{sheet_file}': '{columns[0]}' is not a barcode")
+            if barcode in barcodes:
+                raise ValueError(f"Barcode {barcode} is in '{sheet_file}' more than once")
+            barcodes[barcode] = columns[1]
+    if not barcodes:
+        raise ValueError(f"No barcodes found in '{sheet_file}'")
+    return barcodes
+
+# Defining function giving every sequence with exactly `mismatches` different bases to the barcode.
+# N is included, because the sequencer writes N for a base it could not read
+def barcode_neighbors(barcode, mismatches):
+    for positions in combinations(range(len(barcode)), mismatches):
+        alternatives = [[base for base in "ACGTN" if base != barcode[i]] for i in positions]
+        for bases in product(*alternatives):
+            neighbor = list(barcode)
+            for i, base in zip(positions, bases):
+                neighbor[i] = base
+            yield ''.join(neighbor)
+
+# Defining function to build the lookup table once for all reads. Barcodes are grouped by length,
+# and for every length a dictionary gives sequence -> (number of mismatches, position in the sample sheet).
+# Normally all barcodes have the same length, then a read needs just two dictionary lookups.
+# With max_mismatches > 0 the neighbors of every barcode are added as well. A neighbor that is within
+# max_mismatches of two different barcodes is ambiguous and left out, and a real barcode always stays itself
+def build_barcode_lookup(barcodes, max_mismatches=0):
+    lookup = {}
+    neighbors = {} # (length, neighbor) -> (mismatches, order), None when it belongs to more than one barcode
+    for order, barcode in enumerate(barcodes):
+        lookup.setdefault(len(barcode), {})[barcode.encode()] = (0, order) # reads come as bytes from seq_parser
+        for mismatches in range(1, max_mismatches + 1):
+            for neighbor in barcode_neighbors(barcode, mismatches):
+                key = (len(barcode), neighbor.encode())
+                neighbors[key] = None if key in neighbors else (mismatches, order)
+    for (length, neighbor), hit in neighbors.items():
+        if hit is not None and neighbor not in lookup[length]:
+            lookup[length][neighbor] = hit
+    return sorted(lookup.items()) # [(length, {sequence: (mismatches, order)}), ...]
+
+# Defining the function for the barcode trimming. The first and the last bases of the read are looked up
+# for every barcode length. The match with fewer mismatches wins. If both ends hit equally well, the one earlier
+# in the sample sheet wins and for the same barcode the start wins, like comparing the read with one barcode after the other
+def trim_barcode(seq, qual, lookup): 
+    best = None # (mismatches, order in sample sheet, 0 = start / 1 = end, barcode length)
+    for length, table in lookup:
+        if len(seq) < length:
+            break # lengths are sorted, longer barcodes cannot fit either
+        hit = table.get(seq[:length]) # check if sequence starts with barcode or ....
+        if hit is not None and (best is None or (*hit, 0) < best[:3]):
+            best = (*hit, 0, length)
+        hit = table.get(seq[-length:]) # check if sequence ends with barcode. Better to check in both places even though it should only be in the end
+        if hit is not None and (best is None or (*hit, 1) < best[:3]):
+            best = (*hit, 1, length)
+    if best is None:
+        return None, None, None  # if no barcode was found and the sequence is undetermined 
+    _, order, end, length = best
+    if end:
+        return order, seq[:-length], qual[:-length]
+    return order, seq[length:], qual[length:]
 #------------------------------------------------------------------------------
 
-# Defining function how to handle the fastq file
-def process_fastq(input_file, output_prefix=None):
-    output = {}  # Create empty dictionary 
+# Defining function compressing data with raw deflate, the gzip header and footer are added around it
+def _deflate(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+# Defining function making one gzip member from the data. Members written one after the other are
+# still one valid gzip file, so every flush can be compressed on its own
+def gzip_member(data, level=COMPRESS_LEVEL):
+    return GZIP_HEADER + _deflate(data, level) + struct.pack("<II", zlib.crc32(data), len(data) & 0xffffffff)
+
+# Defining function making BGZF blocks from the data: gzip members of at most BGZF_BLOCK bytes,
+# each with its own compressed size in the header, so tools can jump to any block
+def bgzf_blocks(data, level=COMPRESS_LEVEL):
+    blocks = []
+    for start in range(0, len(data), BGZF_BLOCK):
+        piece = data[start:start + BGZF_BLOCK]
+        deflated = _deflate(piece, level)
+        blocks.append(BGZF_HEADER + struct.pack("<H", len(deflated) + 25) + deflated
+                      + struct.pack("<II", zlib.crc32(piece), len(piece)))
+    return b"".join(blocks)
+
+# Defining function to open the output layer. It gets the file names (index = sample) and keeps for every
+# sample a list of record blocks waiting to be written. Files are only opened when they get written to.
+# compression is None, "gzip" or "bgzf", the compression runs on `threads` threads
+def open_sample_writer(file_names, buffer_size=BUFFER_SIZE, max_open_files=MAX_OPEN_FILES, compression=None, threads=None):
+    if compression not in (None, "gzip", "bgzf"):
+        raise ValueError(f"Unknown compression '{compression}', use gzip or bgzf")
+    return {
+        "files": list(file_names),
+        "buffers": [[] for _ in file_names],  # record blocks waiting per sample
+        "records": [0] * len(file_names),      # number of records per sample
+        "started": set(),                      # samples whose file was already created
+        "handles": OrderedDict(),              # open files, least recently used first
+        "waiting": 0,                          # bytes in all buffers together
+        "buffer_size": buffer_size,
+        "max_open_files": max(1, max_open_files),
+        "compression": compression,
+        "compress": {"gzip": gzip_member, "bgzf": bgzf_blocks}.get(compression),
+        "pool": ThreadPoolExecutor(threads or os.cpu_count()) if compression else None,
+    }
+
+# Defining function to add fastq records of one sample (bytes, every line ending with "\n") to its buffer.
+# When all buffers together are bigger than buffer_size, everything is written out
+def write_records(writer, index, data, record_count):
+    writer["buffers"][index].append(data)
+    writer["records"][index] += record_count
+    writer["waiting"] += len(data)
+    if writer["waiting"] >= writer["buffer_size"]:
+        flush_sample_writer(writer)
+
+# Defining function to get the open file of a sample. If too many files are open, the one that
+# was used longest ago is closed. A file is created ("wb") the first time and appended ("ab") afterwards
+def _sample_handle(writer, index):
+    handles = writer["handles"]
+    if index in handles:
+        handles.move_to_end(index)
+        return handles[index]
+    if len(handles) >= writer["max_open_files"]:
+        handles.popitem(last=False)[1].close()
+    handles[index] = open(writer["files"][index], 'ab' if index in writer["started"] else 'wb')
+    writer["started"].add(index)
+    return handles[index]
+
+# Defining function writing every buffer to its file, one write call per sample. With compression
+# the buffers are cut into pieces of COMPRESS_PIECE bytes that are compressed at the same time on the
+# thread pool, map gives them back in order, so the file is the same as when compressed on one thread
+def flush_sample_writer(writer):
+    pieces = [] # (sample index, data)
+    for index, buffer in enumerate(writer["buffers"]):
+        if buffer:
+            data = b"".join(buffer)
+            buffer.clear()
+            if writer["compress"] is None:
+                pieces.append((index, data))
+            else:
+                pieces.extend((index, data[start:start + COMPRESS_PIECE]) for start in range(0, len(data), COMPRESS_PIECE))
+    writer["waiting"] = 0
+    if writer["compress"] is not None:
+        compressed = writer["pool"].map(writer["compress"], [data for _, data in pieces])
+        pieces = zip([index for index, _ in pieces], compressed)
+    for index, data in pieces:
+        _sample_handle(writer, index).write(data)
+
+# Defining function to write what is left and close all files. Samples without any read still get
+# an (empty) file, like before. A gzip file gets an empty member then and every BGZF file ends with the
+# end-of-file block. Returns the number of records written per sample
+def close_sample_writer(writer):
+    flush_sample_writer(writer)
+    for index in range(len(writer["files"])):
+        if writer["compression"] == "bgzf":
+            _sample_handle(writer, index).write(BGZF_EOF)
+        elif index not in writer["started"]:
+            handle = _sample_handle(writer, index)
+            if writer["compression"] == "gzip":
+                handle.write(gzip_member(b""))
+    for handle in writer["handles"].values():
+        handle.close()
+    writer["handles"].clear()
+    if writer["pool"] is not None:
+        writer["pool"].shutdown()
+    return writer["records"]
+
+# Defining function to sort one block of reads (from seq_parser.read_fastq_blocks). Matched reads are trimmed,
+# every read without a barcode stays unchanged and goes to index `undetermined`.
+# Returns {sample index: (records as bytes, number of records)}
+def demultiplex_block(block, lookup, undetermined):
+    samples = {}
+    for header, seq, plus, qual in seq_parser.fastq_block_records(block):
+        order, trimmed_seq, trimmed_qual = trim_barcode(seq, qual, lookup)  # Looks up both ends of the read and removes the barcode if matched
+        if order is None:  # If no barcode matched the sequence
+            samples.setdefault(undetermined, []).append(b"\n".join((header, seq, plus, qual)))
+        else:
+            samples.setdefault(order, []).append(b"\n".join((header, trimmed_seq, plus, trimmed_qual)))
+    return {index: (b"\n".join(records) + b"\n", len(records)) for index, records in samples.items()}
+
+# Lookup table of the worker process, sent once when the worker starts instead of with every block
+_worker_lookup = None
+
+def _init_worker(lookup, undetermined):
+    global _worker_lookup
+    _worker_lookup = (lookup, undetermined)
+
+def _demultiplex_task(block):
+    return demultiplex_block(block, *_worker_lookup)
+
+# Defining a generator giving the sorted blocks of the fastq file in file order. With more than one worker
+# the blocks are handed out to a pool with seq_parser.ordered_pool_map (2 blocks per worker on the way)
+def demultiplex_blocks(input_file, lookup, undetermined, workers=1, block_size=seq_parser.BLOCK_SIZE):
+    blocks = seq_parser.read_fastq_blocks(input_file, block_size)  # seq_parser cuts the file into blocks of whole records
+    if workers <= 1:
+        for block in blocks:
+            yield demultiplex_block(block, lookup, undetermined)
+        return
+    with Pool(workers, initializer=_init_worker, initargs=(lookup, undetermined)) as pool:
+        yield from seq_parser.ordered_pool_map(pool, _demultiplex_task, blocks, 2 * workers)
+
+# Defining function how to handle the fastq file. Matched reads go trimmed to their sample,
+# every read without a barcode goes unchanged to the undetermined file (last index of the writer).
+# Returns the number of reads per sample, undetermined last
+def process_fastq(input_file, barcodes, output_prefix=None, max_mismatches=0, workers=1, compression=None,
+                  buffer_size=BUFFER_SIZE, max_open_files=MAX_OPEN_FILES):
+    lookup = build_barcode_lookup(barcodes, max_mismatches)  # built once, then every read is just looked up
+    suffix = ".gz" if compression else ""  # gzip and BGZF files are both read as .gz
+    file_names = [(f"{output_prefix}_{filename}" if output_prefix else filename) + suffix
+                  for filename in list(barcodes.values()) + [undetermined_file]]
+    undetermined = len(barcodes)  # index of the undetermined file
+    if not os.path.exists(input_file):
+        print(f"Error: File '{input_file}' not found.")
+        sys.exit(1)
+    writer = open_sample_writer(file_names, buffer_size, max_open_files, compression)
     try:
-        for barcode, filename in barcodes.items():
-            name = f"{output_prefix}_{filename}" if output_prefix else filename
-            output[barcode] = open(name, 'w')
-    
-            undetermined_name = f"{output_prefix}_{undetermined_file}" if output_prefix else undetermined_file
-            undetermined = open(undetermined_name, 'w')
+        for samples in demultiplex_blocks(input_file, lookup, undetermined, workers):
+            for index, (data, record_count) in samples.items():
+                write_records(writer, index, data, record_count)
+        return close_sample_writer(writer)  # Writes the rest and closes all output files
     except IOError as e:
-            print(f"File error: {e}")
-            sys.exit(1)
-    try:
-        with open(input_file, 'r') as a:  # Opens fastq input file in reading mode
-            while True:  # Starting a WHILE loop, which indicates a condition with a boolean. "while" a condition is "true", the loop continues
-                header = a.readline().strip()  # Reading header and removing whitespace 
-                seq = a.readline().strip() 
-                plus = a.readline().strip()  
-                qual = a.readline().strip()  
-
-                if not header:  # If no header is found in the line, this is the end of the file
-                    break  # Exits WHILE loop, when boolean "true" no longer holds
-
-                matched = False  # Initializes a flag to track if a barcode match is found
-
-                for barcode in barcodes:  # FOR loop inside WHILE loop. While line starts with header, it will look for matching barcodes
-                    try: 
-                        trimmed_seq, trimmed_qual = trim_barcode(seq, qual, barcode)  # Calls the trimming function to remove barcode if matched
-                    except Exception as e:
-                        print(f"Error trimming barcode: {e}")
-                        continue
-
-                    if trimmed_seq is not None:  # If a match was found and trimming was successful
-                        output[barcode].write(f"{header}\n{trimmed_seq}\n{plus}\n{trimmed_qual}\n")  # Writes trimmed sequence to the corresponding output file
-                        matched = True  # Sets the match flag to True
-                        break  # Exits FOR loop when match was found
-
-        if not matched:  # If no barcode matched the sequence
-            undetermined.write(f"{header}\n{seq}\n{plus}\n{qual}\n")  # Writes the original sequence to the undetermined file
-    except FileNotFoundError:
-        print(f"Error: File '{input_file}' not found.")
+        print(f"File error: {e}")
         sys.exit(1)
     except Exception as e:
         print(f"Unexpected error while processing FASTQ: {e}")
         sys.exit(1)
+    finally:
+        for handle in writer["handles"].values():  # nothing stays open after an error
+            handle.close()
+        if writer["pool"] is not None:
+            writer["pool"].shutdown()
 
-    for trimmed_out in output.values():  # Starting another FOR loop to check for trimmed output in the output values
-        trimmed_out.close()  # Closes each output file when loop ran
+#------------------------------------------------------------------------------
 
-    undetermined.close()  # Closes the undetermined output file
+if __name__ == "__main__":
+    # Setting the arguments for my code. I use the output file from the previous section (dna2protein) as input file here
+    if len(sys.argv) < 3:
+        sys.argv = ["barcode_trim.py", "barcode.fastq", "trimmed_DNA.txt"]
 
-#------------------------------------------------------------------------------
+    barcode_in = sys.argv[1]
+    trimmed = sys.argv[2]
+    sample_sheet = sys.argv[3] if len(sys.argv) > 3 else default_sample_sheet
+    max_mismatches = int(sys.argv[4]) if len(sys.argv) > 4 else 0 # 1 or 2 corrects sequencing errors in the barcode
+    if max_mismatches not in (0, 1, 2):
+        print("Error: max_mismatches has to be 0, 1 or 2.")
+        sys.exit(1)
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else 1 # processes sorting the reads, e.g. os.cpu_count()
+    compression = sys.argv[6].lower() if len(sys.argv) > 6 else "none" # none, gzip or bgzf for the output files
+    if compression not in ("none", "gzip", "bgzf"):
+        print("Error: compression has to be none, gzip or bgzf.")
+        sys.exit(1)
+    compression = None if compression == "none" else compression
 
-# Run the barcode trimming
-process_fastq(barcode_in, trimmed)
-print("Barcode trimming complete. Output files created.")
+    # Validate input file
+    if not os.path.exists(barcode_in):
+        print(f"Error: '{barcode_in}' does not exist.")
+        sys.exit(1)
+    if not os.path.isfile(barcode_in):
+        print(f"Error: '{barcode_in}' is not a file.")
+        sys.exit(1)
+    if not barcode_in.lower().endswith(('.fastq', '.fq', '.fastq.gz', '.fq.gz')):  # gzip is found from the file content, not the name
+        print(f"Warning: '{barcode_in}' does not look like a fastq file, trying anyway.")
 
-#------------------------------------------------------------------------------
-#------------------------------------------------------------------------------
+    # Validate output path
+    output_dir = os.path.dirname(trimmed)
+    if output_dir and not os.path.exists(output_dir):
+        print(f"Error: '{output_dir}' does not exist.")
+        sys.exit(1)
+
+    # Reading the barcodes from the sample sheet
+    try:
+        barcodes = read_sample_sheet(sample_sheet)
+    except (IOError, ValueError) as e:
+        print(f"Sample sheet error: {e}")
+        sys.exit(1)
+
+    # Run the barcode trimming
+    read_counts = process_fastq(barcode_in, barcodes, trimmed, max_mismatches, workers, compression)
+    print(f"Barcode trimming complete. {sum(read_counts[:-1])} reads assigned, {read_counts[-1]} undetermined. Output files created.")
+
+    #------------------------------------------------------------------------------
 
-# Optional: In case I want to see the output printed on screen
-show_output = input("Do you want to print the contents of the output files to screen? (yes/no): ").strip().lower()
-if show_output == 'yes':
-    print("\n--- Content of output files ---")
-    for filename in barcodes.values():
-        full_name = f"{trimmed}_{filename}"
-        if os.path.exists(full_name):
-            print(f"\nContents of {full_name}:")
-            with open(full_name, 'r') as f:
-                print(f.read())
-    undetermined_name = f"{trimmed}_{undetermined_file}"
-    if os.path.exists(undetermined_name):
-        print(f"\nContents of {undetermined_name}:")
-        with open(undetermined_name, 'r') as f:
-            print(f.read())
+    # Optional: In case I want to see the output printed on screen
+    show_output = input("Do you want to print the contents of the output files to screen? (yes/no): ").strip().lower()
+    if show_output == 'yes':
+        print("\n--- Content of output files ---")
+        suffix = ".gz" if compression else ""
+        for filename in list(barcodes.values()) + [undetermined_file]:
+            full_name = f"{trimmed}_{filename}{suffix}"
+            if os.path.exists(full_name):
+                print(f"\nContents of {full_name}:")
+                with seq_parser.open_input(full_name) as f:  # decompresses gzip and BGZF outputs
+                    print(f.read().decode())
 
 
 
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script name:
+    benchmark_Q2.py
+
+Description:
+    Benchmark and regression check for the hot functions of ArianeNeumannQ2a.py and
+    ArianeNeumannQ2b.py (read_sequence, gc_content and find_motif).
+    Synthetic genomes from 1 kb up to 100 Mb are generated with different GC bias and
+    with a known number of planted motifs. Every function is timed across window sizes
+    and motif lengths, and the throughput (bases per second) and the peak memory
+    (tracemalloc) are recorded. A checksum of every result is stored as well, so a
+    change that gives different numbers is found, not only a change that is slower.
+    The results can be saved as baseline and later runs are compared against it.
+    Before timing, gc_content_array (NumPy) and gc_content (list) are checked against a
+    window by window reference for window sizes where rounding differences show up,
+    and find_motif/find_motifs are checked on sequences shorter than the motif.
+
+User defined functions:
+    make_genome, planted_motif, write_fasta, measure, checksum, reference_gc_content, check_gc_array,
+    check_short_sequences, run_benchmarks, compare_to_baseline
+
+Procedure:
+    0. Check that the NumPy and the list GC content give the reference values, and that motif
+       search works on sequences shorter than the motif
+    1. Generate synthetic genomes (fixed random seed, so every run gets the same genomes)
+    2. Time read_sequence, gc_content and find_motif on every genome
+    3. Save as baseline, or compare with the saved baseline
+    4. Exit with code 1 if something got slower than the tolerance or gives other results
+
+Input:
+    (optional) baseline file, default "benchmark_baseline.json"
+
+Output:
+    benchmark_baseline.json (with "save"), table printed to screen
+
+Usage:
+    python3 benchmark_Q2.py [max_size] [save|compare] [baseline_file] [tolerance]
+    e.g. python3 benchmark_Q2.py 100000000 save
+         python3 benchmark_Q2.py 100000000 compare benchmark_baseline.json 0.2
+
+Version: 1.0 Date 2025-11-06 Author: Ariane Neumann
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import tempfile
+import tracemalloc
+from itertools import accumulate
+import numpy as np
+
+import ArianeNeumannQ2a as q2a
+import ArianeNeumannQ2b as q2b
+
+GENOME_SIZES = [1_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+GC_BIASES = [0.35, 0.65]              # fraction of G + C in the synthetic genome
+MOTIF_DENSITIES = [1e-4, 1e-2]        # planted motifs per base
+WINDOW_SIZES = [5, 1_000, 10_000]
+MOTIF_LENGTHS = [4, 8, 16]
+CHECK_WINDOW_SIZES = [5, 2000, 4000, 10_000] # 1 GC in 2000 is exactly 0.05 %, a rounding tie
+CHECK_SHORT_SEQUENCES = ["", "A", "AC", "ACG", "ACGTT"] # shorter than (some of) the motifs searched
+
+#========================== Defining functions =================================
+
+# Defining function to generate a synthetic genome. The motif of every length is planted
+# motif_density * size times at random positions, on top of the random background
+def make_genome(size: int, gc_bias: float, motif_density: float, seed: int = 1) -> str:
+    rng = np.random.default_rng(seed)
+    at, gc = (1 - gc_bias) / 2, gc_bias / 2
+    genome = rng.choice(np.frombuffer(b"ACGT", dtype=np.uint8), size=size, p=[at, gc, gc, at])
+    for length in MOTIF_LENGTHS:
+        if size < length:
+            continue
+        motif = np.frombuffer(planted_motif(length).encode(), dtype=np.uint8)
+        for start in rng.integers(0, size - length + 1, size=int(size * motif_density / len(MOTIF_LENGTHS))):
+            genome[start:start + length] = motif
+    return genome.tobytes().decode("ascii")
+
+# Defining function for the motif that is planted (and searched) for a given length
+def planted_motif(length: int) -> str:
+    return ("TATAAAGGCCTTGACG" * 2)[:length]
+
+# Defining function to write a genome as fasta with 60 letters per line, like real files
+def write_fasta(sequence: str, file_path: str):
+    with open(file_path, "w") as a:
+        a.write(">synthetic\n")
+        for i in range(0, len(sequence), 60):
+            a.write(sequence[i:i + 60] + "\n")
+
+# Defining function to time one call. Returns seconds, peak memory in MB and the result.
+# The time is the best of several runs (small genomes are too fast for a single run),
+# the peak memory is measured in a separate run, because tracemalloc slows the code down
+def measure(function, *arguments, repeats: int = 3):
+    seconds = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*arguments)
+        seconds = min(seconds, time.perf_counter() - start)
+        del result
+    tracemalloc.start()
+    result = function(*arguments)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return seconds, peak, result
+
+# Defining function for a short checksum of a result, to see if a result changed
+def checksum(result) -> str:
+    return format(zlib.crc32(repr(result).encode()), "08x")
+
+# Defining function for the GC content written out window by window with round(), like the first
+# version of gc_content. Only used as the reference for check_gc_array
+def reference_gc_content(sequence: str, window_size: int) -> list:
+    prefix = list(accumulate((base in "GC" for base in sequence), initial=0))
+    return [round(((prefix[i + window_size] - prefix[i]) / window_size) * 100, 1)
+            for i in range(len(sequence) - window_size + 1)]
+
+# Defining function comparing gc_content_array and gc_content with the reference on synthetic genomes.
+# Returns a list of the cases where the values differ (empty when everything is the same)
+def check_gc_array(size: int) -> list:
+    mismatches = []
+    for gc_bias in [0.01] + GC_BIASES: # very low GC gives counts like 1 in 2000
+        sequence = make_genome(size, gc_bias, 0)
+        for window_size in CHECK_WINDOW_SIZES:
+            expected = reference_gc_content(sequence, window_size)
+            differing = int(np.count_nonzero(np.array(expected) != q2a.gc_content_array(sequence, window_size)))
+            if differing:
+                mismatches.append(f"gc={gc_bias} window={window_size}: {differing} windows of gc_content_array differ")
+            if q2a.gc_content(sequence, window_size) != expected:
+                mismatches.append(f"gc={gc_bias} window={window_size}: gc_content differs")
+    return mismatches
+
+# Defining function checking find_motif, find_motifs and find_motifs_parallel on sequences shorter than the
+# motif, where there is no window at all. Every hit is compared with a plain scan. Returns a list of the
+# cases that differ or fail
+def check_short_sequences() -> list:
+    mismatches = []
+    motifs = [planted_motif(length) for length in MOTIF_LENGTHS] + ["ACG", "A"]
+    records = [(f"record{number}", sequence) for number, sequence in enumerate(CHECK_SHORT_SEQUENCES)]
+    try: # short records, and chunks of 4 bases so the last chunk of a record is shorter than most motifs
+        parallel = q2b.find_motifs_parallel(records, motifs, both_strands=False, workers=1, chunk_size=4)
+    except Exception as e:
+        mismatches.append(f"find_motifs_parallel: {type(e).__name__}: {e}")
+        parallel = None
+    for name, sequence in records:
+        for motif in motifs:
+            expected = [i + 1 for i in range(len(sequence) - len(motif) + 1) if sequence[i:i + len(motif)] == motif]
+            try:
+                found = q2b.find_motif(sequence, motif)
+                found_all = q2b.find_motifs(sequence, motifs, both_strands=False)[(motif, "+")]
+            except Exception as e:
+                mismatches.append(f"sequence='{sequence}' motif={motif}: {type(e).__name__}: {e}")
+                continue
+            if found != expected or found_all != expected:
+                mismatches.append(f"sequence='{sequence}' motif={motif}: {found} / {found_all} instead of {expected}")
+            if parallel is not None and parallel[name][(motif, "+")] != expected:
+                mismatches.append(f"sequence='{sequence}' motif={motif}: find_motifs_parallel differs")
+    return mismatches
+
+# Defining function running every benchmark case up to max_size. Returns {case name: numbers}
+def run_benchmarks(max_size: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for size in [size for size in GENOME_SIZES if size <= max_size]:
+            for gc_bias in GC_BIASES:
+                for motif_density in MOTIF_DENSITIES:
+                    genome_name = f"size={size} gc={gc_bias} density={motif_density}"
+                    fasta_file = os.path.join(folder, "genome.fna")
+                    write_fasta(make_genome(size, gc_bias, motif_density), fasta_file)
+
+                    cases = [("read_sequence", q2a.read_sequence, (fasta_file,))]
+                    sequence = q2a.read_sequence(fasta_file)
+                    for window_size in WINDOW_SIZES:
+                        cases.append((f"gc_content window={window_size}", q2a.gc_content, (sequence, window_size)))
+                    for length in MOTIF_LENGTHS:
+                        cases.append((f"find_motif length={length}", q2b.find_motif, (sequence, planted_motif(length))))
+
+                    for case, function, arguments in cases:
+                        seconds, peak, result = measure(function, *arguments, repeats=3 if size <= 1_000_000 else 1)
+                        key = f"{case} | {genome_name}"
+                        results[key] = {
+                            "seconds": round(seconds, 6),
+                            "bases_per_second": round(size / max(seconds, 1e-9)),
+                            "peak_mb": round(peak, 3),
+                            "checksum": checksum(result),
+                        }
+                        print(f"{key:<70} {results[key]['bases_per_second']:>14,} bases/s {peak:>10.1f} MB")
+                        del result
+    return results
+
+# Defining function to compare with the baseline. A case is a regression when the throughput is more
+# than tolerance lower, the peak memory more than tolerance higher, or the checksum differs
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for key, now in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue # new case, nothing to compare with
+        if now["checksum"] != before["checksum"]:
+            regressions.append(f"{key}: result changed ({before['checksum']} -> {now['checksum']})")
+        if now["bases_per_second"] < before["bases_per_second"] * (1 - tolerance):
+            regressions.append(f"{key}: slower ({before['bases_per_second']:,} -> {now['bases_per_second']:,} bases/s)")
+        if now["peak_mb"] > before["peak_mb"] * (1 + tolerance) + 1: # 1 MB slack for tiny genomes
+            regressions.append(f"{key}: more memory ({before['peak_mb']} -> {now['peak_mb']} MB)")
+    return regressions
+
+#============================= Calling functions ==============================
+
+if __name__ == "__main__":
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    mode = sys.argv[2] if len(sys.argv) > 2 else "compare"
+    baseline_file = sys.argv[3] if len(sys.argv) > 3 else "benchmark_baseline.json"
+    tolerance = float(sys.argv[4]) if len(sys.argv) > 4 else 0.2
+
+    mismatches = check_gc_array(min(max_size, 100_000))
+    for mismatch in mismatches:
+        print(f"MISMATCH gc_content_array/gc_content vs reference {mismatch}")
+    short_mismatches = check_short_sequences()
+    for mismatch in short_mismatches:
+        print(f"MISMATCH find_motif on a short sequence {mismatch}")
+    if mismatches or short_mismatches:
+        sys.exit(1)
+
+    results = run_benchmarks(max_size)
+
+    if mode == "save":
+        with open(baseline_file, "w") as a:
+            json.dump(results, a, indent=1)
+        print(f"Baseline saved to {baseline_file}")
+    elif not os.path.exists(baseline_file):
+        print(f"No baseline '{baseline_file}' yet, run with 'save' first.")
+    else:
+        with open(baseline_file) as a:
+            regressions = compare_to_baseline(results, json.load(a), tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions compared to the baseline.")
@@ -10,7 +10,8 @@ Output:
     text file "translated_seq.txt"
     
 Description: 
-    The task is to translate a DNA nucleotide sequence into a protein amino acid sequence using the standard genetic code.
+    The task is to translate a DNA nucleotide sequence into a protein amino acid sequence using the standard genetic code
+    (other NCBI translation tables, e.g. 2, 4 or 11, can be chosen as well).
     First, I need to create a "fasta" or similar text file with different sequences. (Of course one can also use already available files).
     The file can contain not only "A,G,T,C" but also "N". Unknown bases are translated into "X" amino acid, and stop codons should
     be displayed as "*" in the protein sequence.  
@@ -23,10 +24,18 @@ Procedure:
     5. Write to output file
  
 User defined functions: 
-    read_fasta, translate_sequence
+    read_fasta, iter_fasta, ask_strand_type, translate_sequence, translate_batch, codon_indices,
+    build_codon_table, translate_records, write_proteins, reverse_complement, reverse_complement_records,
+    six_frame_translation, six_frame_records, find_orfs, orf_records, batched, parallel_translate_records,
+    build_ncbi_table
     
 Usage: 
-    python3 dna2protein.py DNA_seq.fasta translated_seq.txt
+    python3 dna2protein.py DNA_seq.fasta translated_seq.txt [mode] [min_orf_length] [workers] [batch_size] [table_id]
+    mode: translate (default, frame +1), sixframe (all six frames) or orf (open reading frames
+    with at least min_orf_length amino acids, default 100, coordinates in the headers)
+    workers > 1: batch run on several processes without questions, batch_size records per task (default 1000)
+    table_id: NCBI genetic code (default 1, standard). In orf mode the alternative start codons of
+    tables other than 1 are used as well
 
 Version: 1.0
 Date 2025-10-18
@@ -35,27 +44,10 @@ Author: Ariane Neumann
 #------------------------------------------------------------------------------
 import sys
 import os
+from multiprocessing import Pool
+import numpy as np
+import seq_parser
 
-# first setting the arguments for my code
-if len(sys.argv) != 3: # script is 0 + input + output = 3
-    sys.argv = ["dna2protein.py", "DNA_seq.fasta", "translated_seq.txt"]  # I modified a fasta file from my old project, so i kept the ".fasta"
-# for sharing the script with someone, I might need to add a "sys.exit" check here. But for whatever reason it always crashes my code. So for now, I will leave it out.
-DNAseq = sys.argv[1]
-seq_translated = sys.argv[2]
-
-# Validate my input and output files, to be sure they open and exist
-# Input
-if not os.path.exists(DNAseq): 
-    print(f"Error: '{DNAseq}' does not exist.")
-    sys.exit(1)
-if not DNAseq.lower().endswith(('.fna', '.fa', '.fasta')):
-    print(f"Warning: '{DNAseq}' is NOT a FASTA file.")
-# Output
-output_dir = os.path.dirname(seq_translated)
-if output_dir and not os.path.exists(output_dir):
-    print(f"Error: '{output_dir}' does not exist.")
-    sys.exit(1)
-     
 #------------------------------------------------------------------------------
 # Creating a dictionary for the standard genetic code. Would be great ot have this within the "read_fasta" function, but did not manage
 genetic_code = {                    
@@ -79,121 +71,334 @@ genetic_code = {
 
 #------------------------------------------------------------------------------
 
-# Defining a function for reading the fasta file
-def read_fasta(file_path): 
-    sequences = {}  # Dictionary for sequences with headers
-    
+# Defining a function asking if the input is the coding strand
+def ask_strand_type():
     # Error checking if DNA strand is codig or non-coding
     strand_type = input("Is the input the coding strand? (yes/no): ").strip().lower()
 
     if strand_type == "yes": # checking if this is coding strand
         print("--> Super, let's go with the coding strand")
     elif strand_type == "no":
-        print("--> Ok, first convert T to U.") # if user says non-coding strand, then T needs to be converted to U first. 
-        for seq_id in sequences:
-            sequences[seq_id] = sequences[seq_id].replace('T', 'U')
-        print("Conversion complete. Proceeding with translation.")
+        print("--> Ok, translating the reverse complement.") # the coding strand is the reverse complement of the non-coding strand
     else:
         print("Invalid input. Please answer 'yes' or 'no'.")
         sys.exit(1)
+    return strand_type
 
-    with open(file_path, 'r') as a:
-        current_id = ''         # current sequence ID
-        found_sequence = False  # Inbuilt check with boolean to make sure that sequence is found
-
-        for line in a:
-            line = line.strip()  # Remove whitespaces in beginning and end of sequence. 
-
-            if not line:
-                continue  # Skip empty lines. Might not be needed here, since I generated the file myself. But can happen in manually generated files
-
-            if line.startswith('>'): # The sequences always start with a header line ">", this prompt tells the code where to start reading
-                current_id = line[1:]
-                sequences[current_id] = '' # empty string for this sequence. Also making sure that multi-line sequences are part of the current sequence and are appended
-            else:
-                if current_id == '':
-                    # Sequence line appears before any header — malformed FASTA
-                    print("Error: FASTA file appears malformed. Sequence found before any header.")
-                    sys.exit(1) # exit silently if error occurs
+# Defining a generator for reading the fasta file one record at a time. Only the current record
+# is in memory, the lines of a multi-line record are collected in a list and joined once at the end
+def iter_fasta(file_path):
+    found_header = False
+    found_sequence = False  # Inbuilt check with boolean to make sure that sequence is found
 
-                # Add sequence data to the current sequence in case of multi-line sequences
-                sequences[current_id] += line.upper() # ensures consistent formatting. 
-                found_sequence = True
+    # seq_parser reads the file in big blocks and already skips empty lines and removes whitespace
+    for header, sequence in seq_parser.read_fasta_records(file_path):
+        if header is None:
+            # Sequence line appears before any header — malformed FASTA
+            print("Error: FASTA file appears malformed. Sequence found before any header.")
+            sys.exit(1) # exit silently if error occurs
+        found_header = True
+        found_sequence = found_sequence or bool(sequence)
+        yield header.decode(), sequence.upper().decode("ascii", "replace") # ensures consistent formatting
 
     # Final checks after reading the file to make sure they exist
-    if not sequences:
+    if not found_header:
         print("Error: No sequences found in the FASTA file.")
         sys.exit(1)
     if not found_sequence:
         print("Error: Headers found but no sequence data.")
         sys.exit(1)
-    return sequences  # Return the dictionary of sequences
 
-    
+# Defining a function for reading the whole fasta file into a dictionary {header: sequence}
+def read_fasta(file_path): 
+    ask_strand_type()
+    return dict(iter_fasta(file_path))  # Return the dictionary of sequences
+
 #------------------------------------------------------------------------------
  
+# Building lookup tables from the genetic code, so a whole sequence can be translated at once with NumPy.
+# Every base gets a number (A=0, C=1, G=2, T/U=3, anything else=4), a codon is then 16*first + 4*second + third,
+# which gives 64 codons. Codon number 64 is used for every codon with N or an unknown letter and translates to "X"
+BASE_INDEX = np.full(256, 4, dtype=np.uint8)
+for number, bases in enumerate(("A", "C", "G", "TU")):
+    for base in bases:
+        BASE_INDEX[ord(base)] = number
+
+def build_codon_table(code: dict) -> np.ndarray:
+    table = np.full(65, ord('X'), dtype=np.uint8) # position 64 stays "X"
+    for codon, amino_acid in code.items():
+        table[16 * "ACGT".index(codon[0]) + 4 * "ACGT".index(codon[1]) + "ACGT".index(codon[2])] = ord(amino_acid)
+    return table
+
+# NCBI translation tables (https://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi) in the NCBI short form:
+# amino acids and start codons ("M") for the 64 codons in the order TTT, TTC, TTA, TTG, TCT, ... GGG (bases T, C, A, G).
+# Tables with context dependent stop codons (27, 28, 31) are left out
+NCBI_TABLES = {
+    1:  ("Standard", "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "---M---------------M---------------M----------------------------"),
+    2:  ("Vertebrate Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG", "--------------------------------MMMM---------------M------------"),
+    3:  ("Yeast Mitochondrial", "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "----------------------------------MM----------------------------"),
+    4:  ("Mold, Protozoan, Coelenterate Mitochondrial and Mycoplasma/Spiroplasma", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "--MM---------------M------------MMMM---------------M------------"),
+    5:  ("Invertebrate Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG", "---M----------------------------MMMM---------------M------------"),
+    6:  ("Ciliate, Dasycladacean and Hexamita Nuclear", "FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "-----------------------------------M----------------------------"),
+    9:  ("Echinoderm and Flatworm Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG", "-----------------------------------M---------------M------------"),
+    10: ("Euplotid Nuclear", "FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "-----------------------------------M----------------------------"),
+    11: ("Bacterial, Archaeal and Plant Plastid", "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "---M---------------M------------MMMM---------------M------------"),
+    12: ("Alternative Yeast Nuclear", "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "-------------------M---------------M----------------------------"),
+    13: ("Ascidian Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG", "---M------------------------------MM---------------M------------"),
+    14: ("Alternative Flatworm Mitochondrial", "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG", "-----------------------------------M----------------------------"),
+    16: ("Chlorophycean Mitochondrial", "FFLLSSSSYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "-----------------------------------M----------------------------"),
+    21: ("Trematode Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNNKSSSSVVVVAAAADDEEGGGG", "-----------------------------------M---------------M------------"),
+    22: ("Scenedesmus obliquus Mitochondrial", "FFLLSS*SYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "-----------------------------------M----------------------------"),
+    23: ("Thraustochytrium Mitochondrial", "FF*LSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "--------------------------------M--M---------------M------------"),
+    24: ("Rhabdopleuridae Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG", "---M---------------M---------------M---------------M------------"),
+    25: ("Candidate Division SR1 and Gracilibacteria", "FFLLSSSSYY**CCGWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "---M-------------------------------M---------------M------------"),
+    26: ("Pachysolen tannophilus Nuclear", "FFLLSSSSYY**CC*WLLLAPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "-------------------M---------------M----------------------------"),
+    29: ("Mesodinium Nuclear", "FFLLSSSSYYYYCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "-----------------------------------M----------------------------"),
+    30: ("Peritrich Nuclear", "FFLLSSSSYYEECC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "-----------------------------------M----------------------------"),
+    32: ("Balanophoraceae Plastid", "FFLLSSSSYY*WCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG", "---M---------------M------------MMMM---------------M------------"),
+    33: ("Cephalodiscidae Mitochondrial", "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG", "---M-------------------------------M---------------M------------"),
+}
+
+# Defining the function turning one NCBI table into the arrays used for translation:
+# codon table (65 letters, see above), codon numbers of the start codons and of the stop codons
+def build_ncbi_table(amino_acids: str, starts: str) -> dict:
+    code = {}
+    start_codons = []
+    for i, codon in enumerate(a + b + c for a in "TCAG" for b in "TCAG" for c in "TCAG"): # NCBI codon order
+        code[codon] = amino_acids[i]
+        if starts[i] == 'M':
+            start_codons.append(16 * "ACGT".index(codon[0]) + 4 * "ACGT".index(codon[1]) + "ACGT".index(codon[2]))
+    codons = build_codon_table(code)
+    return {"codons": codons, "starts": np.array(sorted(start_codons)), "stops": np.flatnonzero(codons == ord('*'))}
+
+# All tables are built once when the script starts, translating with another table then only means
+# using another array, the time per codon stays the same. {table id: {"name", "codons", "starts", "stops"}}
+GENETIC_CODES = {}
+for table_id, (name, amino_acids, starts) in NCBI_TABLES.items():
+    GENETIC_CODES[table_id] = {"name": name, **build_ncbi_table(amino_acids, starts)}
+
+# Defining the function giving the codon numbers (0-64) of a sequence, frame +1, incomplete codon at the end is left out
+def codon_indices(dna: str) -> np.ndarray:
+    bases = BASE_INDEX[np.frombuffer(dna.encode("ascii", "replace"), dtype=np.uint8)]
+    codons = bases[:len(bases) // 3 * 3].reshape(-1, 3).astype(np.uint16)
+    indices = codons[:, 0] * 16 + codons[:, 1] * 4 + codons[:, 2]
+    indices[(codons >= 4).any(axis=1)] = 64 # N (or other letter) in the codon -> "X"
+    return indices
+
 # Defining the function for the output file
-def translate_sequence(dna, warned):
-    protein = '' #empty string for translated protein
-    i = 0 # Start at index 0 of DNA sequence
-    
+def translate_sequence(dna, warned, table_id=1):
     if len(dna) % 3 != 0 and not warned: # Check if the sequence length is divisible by 3
         print("Warning: DNA sequence cannot be divided by 3.")
-    
-    # Loop through the DNA sequence in steps of 3 codons
-    while i + 3 <= len(dna): 
-        codon = dna[i:i+3] # 3 nucleotides = 1 codon
-        
-        # Convert T to U, in case of non-coding strand
-        codon = codon.replace('U', 'T')
 
-        if 'N' in codon: # if DNA sequence contains "N", replace in protein sequence with "X". This can be changed to any letter,e.g. "R" in the DNA seq
-            protein += 'X'
-        else:
-            protein += genetic_code.get(codon, 'X') # also translate into "X" if the codon is not correct
-        i += 3
-    return protein, i // 3, warned # integer division operator, as discussed in lecture 1. Dividing the sequence by 3, but returns only whole numbers (meaning it does not takes something that cannot be divided by 3)
+    # All codons are looked up in the table at once instead of one by one. "U" counts as "T",
+    # codons with "N" become "X" and stop codons "*", as before
+    protein = GENETIC_CODES[table_id]["codons"][codon_indices(dna)].tobytes().decode("ascii")
+    return protein, len(dna) // 3, warned # integer division operator, as discussed in lecture 1. Dividing the sequence by 3, but returns only whole numbers (meaning it does not takes something that cannot be divided by 3)
 
-#------------------------------------------------------------------------------
+# Defining the function to translate many sequences with one table lookup. The sequences are joined
+# (cut to whole codons first), translated together and split again into one protein per sequence
+def translate_batch(dna_sequences: list, table_id: int = 1) -> list:
+    trimmed = [dna[:len(dna) // 3 * 3] for dna in dna_sequences]
+    proteins = GENETIC_CODES[table_id]["codons"][codon_indices("".join(trimmed))].tobytes().decode("ascii")
+    result = []
+    start = 0
+    for dna in trimmed:
+        result.append(proteins[start:start + len(dna) // 3])
+        start += len(dna) // 3
+    return result
 
-# This is the actual translation step, calling the functions defined above
-sequences = read_fasta(DNAseq) # this calls the function defined above "read_fasta"
-warned = False
-with open(seq_translated, 'w') as out: # writing into the seq_translated output file with "with open", safe way.
-    for seq_id, dna_seq in sequences.items(): # starting a FOR loop for the sequences and the IDs
-        total_codons = 0 # counts the total codons translated
-        protein_seq, codon_count, warned = translate_sequence(dna_seq, warned) # this calls the "translate_sequence" function defined above.
-        total_codons += codon_count
-        out.write(f">{seq_id}\n{protein_seq}\n")
-        warned = True
-#------------------------------------------------------------------------------
-#------------------------------------------------------------------------------
+# Defining a generator translating records one after the other, yields (header, protein, number of codons)
+def translate_records(records, warned=False, table_id=1):
+    for seq_id, dna_seq in records:
+        protein_seq, codon_count, warned = translate_sequence(dna_seq, warned, table_id) # this calls the "translate_sequence" function defined above.
+        warned = True # warning about the length only once
+        yield seq_id, protein_seq, codon_count
 
-# These statements will be printed only if the script runs without crashing
-print(f"Translation complete. Output written to '{seq_translated}'")
-print(f"Total sequences translated: {len(sequences)}")
-print(f"Total codons processed: {total_codons}")
+# Defining a function writing the translated records as they come in. The output file gets a big
+# write buffer, so many small records become few large writes. Returns (sequences, codons) written
+def write_proteins(translated, output_file, buffer_size=1 << 20):
+    total_sequences = 0
+    total_codons = 0 # counts the total codons translated
+    with open(output_file, 'w', buffering=buffer_size) as out: # writing into the output file with "with open", safe way.
+        for seq_id, protein_seq, codon_count in translated:
+            out.write(f">{seq_id}\n{protein_seq}\n")
+            total_sequences += 1
+            total_codons += codon_count
+    return total_sequences, total_codons
 
-#------------------------------------------------------------------------------
-#------------------------------------------------------------------------------
+# Complement of every base, "U" is complemented like "T". Unknown letters become "N"
+COMPLEMENT = str.maketrans("ACGTUNRYSWKMBDHV", "TGCAANYRSWMKVHDB")
+
+# Defining the function for the reverse complement of a DNA sequence
+def reverse_complement(dna):
+    return dna.translate(COMPLEMENT)[::-1]
 
-# Optional: view the translated sequences, only runs if script did not crash
-# wanted to avoid printing again everything to the screen as in assignment 1
-try: # Another error check to see if the whole code worked.
-    show_sequences = input("Do you want to view the translated sequences? (yes/no): ").strip().lower()
-    if show_sequences == "yes":
-        with open(seq_translated, 'r') as result:
-            print("\nTranslated Sequences:\n")
-            print(result.read())
+# Defining a generator giving the reverse complement of every record, used for the non-coding strand
+def reverse_complement_records(records):
+    for seq_id, dna_seq in records:
+        yield seq_id, reverse_complement(dna_seq)
 
-except Exception:
-    print("This did not work. Try again")
+# Defining the function translating all six reading frames. The reverse complement is made only once
+# and the three frames of each strand are slices of the same sequence. Returns {"+1": protein, ...}
+def six_frame_translation(dna, table_id=1):
+    codons = GENETIC_CODES[table_id]["codons"]
+    strands = {"+": dna, "-": reverse_complement(dna)}
+    frames = {}
+    for strand, sequence in strands.items():
+        for frame in range(3):
+            frames[f"{strand}{frame + 1}"] = codons[codon_indices(sequence[frame:])].tobytes().decode("ascii")
+    return frames
 
+# Defining a generator translating every record in all six frames, yields (header, protein, number of codons)
+def six_frame_records(records, table_id=1):
+    for seq_id, dna_seq in records:
+        for frame, protein_seq in six_frame_translation(dna_seq, table_id).items():
+            yield f"{seq_id} frame={frame}", protein_seq, len(protein_seq)
 
+# Codon number (see codon_indices) of the usual start codon
+ATG = 16 * 0 + 4 * 3 + 2
 
+# Defining the function finding open reading frames: from a start codon to the next stop codon in the
+# same frame, keeping the longest one (first start) per stop. ORFs without stop codon are left out.
+# Coordinates are 1-based on the given sequence, start <= end also for the "-" strand.
+# Yields (frame, start, end, protein without "*"), min_length is the number of amino acids.
+# Without alternative_starts only ATG starts an ORF, otherwise all start codons of the table
+def find_orfs(dna, min_length=100, table_id=1, alternative_starts=False):
+    code = GENETIC_CODES[table_id]
+    start_codons = code["starts"] if alternative_starts else [ATG]
+    stop_codons = code["stops"]
+    length = len(dna)
+    strands = {"+": dna, "-": reverse_complement(dna)}
+    for strand, sequence in strands.items():
+        for frame in range(3):
+            indices = codon_indices(sequence[frame:])
+            stops = np.flatnonzero(np.isin(indices, stop_codons))
+            starts = np.flatnonzero(np.isin(indices, start_codons))
+            next_stop = np.searchsorted(stops, starts) # stop codon following every start codon
+            starts, next_stop = starts[next_stop < len(stops)], next_stop[next_stop < len(stops)]
+            _, first = np.unique(next_stop, return_index=True) # first start before every stop = longest ORF
+            for orf_start, stop in zip(starts[first].tolist(), stops[next_stop[first]].tolist()):
+                if stop - orf_start < min_length:
+                    continue
+                protein = 'M' + code["codons"][indices[orf_start + 1:stop]].tobytes().decode("ascii") # a start codon always reads as M
+                nt_start = frame + 3 * orf_start  # 0-based position on this strand
+                nt_end = frame + 3 * (stop + 1)   # end including the stop codon
+                if strand == "-":
+                    nt_start, nt_end = length - nt_end, length - nt_start
+                yield f"{strand}{frame + 1}", nt_start + 1, nt_end, protein
 
+# Defining a generator of ORFs for every record, in the same (header, protein, codons) form as translate_records,
+# so they can be written with write_proteins
+def orf_records(records, min_length=100, table_id=1, alternative_starts=False):
+    for seq_id, dna_seq in records:
+        number = 0
+        for frame, start, end, protein_seq in find_orfs(dna_seq, min_length, table_id, alternative_starts):
+            number += 1
+            yield f"{seq_id.split()[0]}_ORF{number} frame={frame} start={start} end={end} length={len(protein_seq)}", protein_seq, len(protein_seq) + 1
+
+# Defining a generator cutting the records into lists of batch_size records
+def batched(records, batch_size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# Defining the worker function: translates one batch of records in the chosen mode and sends the
+# finished (header, protein, codons) tuples back. In translate mode the whole batch is one table lookup
+def _translate_batch(task):
+    mode, min_orf_length, table_id, batch = task
+    if mode == "sixframe":
+        return list(six_frame_records(batch, table_id))
+    if mode == "orf":
+        return list(orf_records(batch, min_orf_length, table_id, table_id != 1))
+    proteins = translate_batch([dna_seq for _, dna_seq in batch], table_id)
+    return [(seq_id, protein_seq, len(dna_seq) // 3) for (seq_id, dna_seq), protein_seq in zip(batch, proteins)]
+
+# Defining a generator translating the records on several processes. Batches are handed out to the pool
+# with seq_parser.ordered_pool_map, so the results come back in input order with 2 batches per worker on the way
+def parallel_translate_records(records, mode="translate", min_orf_length=100, workers=None, batch_size=1000, table_id=1):
+    workers = workers or os.cpu_count()
+    with Pool(workers) as pool:
+        tasks = ((mode, min_orf_length, table_id, batch) for batch in batched(records, batch_size))
+        for results in seq_parser.ordered_pool_map(pool, _translate_batch, tasks, 2 * workers):
+            yield from results
+
+#------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    # first setting the arguments for my code
+    if len(sys.argv) < 3: # script is 0 + input + output = 3, mode and minimum ORF length are optional
+        sys.argv = ["dna2protein.py", "DNA_seq.fasta", "translated_seq.txt"]  # I modified a fasta file from my old project, so i kept the ".fasta"
+    # for sharing the script with someone, I might need to add a "sys.exit" check here. But for whatever reason it always crashes my code. So for now, I will leave it out.
+    DNAseq = sys.argv[1]
+    seq_translated = sys.argv[2]
+    mode = sys.argv[3] if len(sys.argv) > 3 else "translate" # translate, sixframe or orf
+    min_orf_length = int(sys.argv[4]) if len(sys.argv) > 4 else 100 # amino acids, only for orf mode
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else 1 # more than 1 worker is a batch run: no questions asked
+    batch_size = int(sys.argv[6]) if len(sys.argv) > 6 else 1000 # records sent to a worker at once
+    table_id = int(sys.argv[7]) if len(sys.argv) > 7 else 1 # NCBI genetic code, e.g. 2 for vertebrate mitochondria
+    if table_id not in GENETIC_CODES:
+        print(f"Error: unknown genetic code table {table_id}. Available: {sorted(GENETIC_CODES)}")
+        sys.exit(1)
+    if mode not in ("translate", "sixframe", "orf"):
+        print(f"Error: unknown mode '{mode}'. Use translate, sixframe or orf.")
+        sys.exit(1)
+
+    # Validate my input and output files, to be sure they open and exist
+    # Input
+    if not os.path.exists(DNAseq): 
+        print(f"Error: '{DNAseq}' does not exist.")
+        sys.exit(1)
+    if not DNAseq.lower().endswith(('.fna', '.fa', '.fasta')):
+        print(f"Warning: '{DNAseq}' is NOT a FASTA file.")
+    # Output
+    output_dir = os.path.dirname(seq_translated)
+    if output_dir and not os.path.exists(output_dir):
+        print(f"Error: '{output_dir}' does not exist.")
+        sys.exit(1)
+
+    #------------------------------------------------------------------------------
+
+    # This is the actual translation step, calling the functions defined above.
+    # The records are read, translated and written one by one (generator pipeline), so the
+    # memory only needs to hold the largest record, not the whole file
+    # In sixframe and orf mode both strands are used anyway, so there is no need to ask for the strand
+    records = iter_fasta(DNAseq)
+    if workers > 1: # coding strand is assumed, records are translated on several processes in batches
+        translated = parallel_translate_records(records, mode, min_orf_length, workers, batch_size, table_id)
+    elif mode == "sixframe":
+        translated = six_frame_records(records, table_id)
+    elif mode == "orf": # with another table than the standard one, its alternative start codons are used too
+        translated = orf_records(records, min_orf_length, table_id, table_id != 1)
+    else:
+        if ask_strand_type() == "no":
+            records = reverse_complement_records(records)
+        translated = translate_records(records, table_id=table_id)
+    total_sequences, total_codons = write_proteins(translated, seq_translated)
 
+    #------------------------------------------------------------------------------
+    #------------------------------------------------------------------------------
 
+    # These statements will be printed only if the script runs without crashing
+    print(f"Translation complete. Output written to '{seq_translated}'")
+    print(f"Total sequences translated: {total_sequences}")
+    print(f"Total codons processed: {total_codons}")
 
+    #------------------------------------------------------------------------------
+    #------------------------------------------------------------------------------
 
+    # Optional: view the translated sequences, only runs if script did not crash
+    # wanted to avoid printing again everything to the screen as in assignment 1
+    try: # Another error check to see if the whole code worked.
+        show_sequences = "no" if workers > 1 else input("Do you want to view the translated sequences? (yes/no): ").strip().lower()
+        if show_sequences == "yes":
+            with open(seq_translated, 'r') as result:
+                print("\nTranslated Sequences:\n")
+                print(result.read())
 
+    except Exception:
+        print("This did not work. Try again")
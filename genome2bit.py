@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script name:
+    genome2bit.py
+
+Description:
+    Converts a (multi-record) fasta file into a 2-bit packed genome file, similar to
+    the UCSC .2bit format. Every base takes 2 bits (A=0, C=1, G=2, T=3), so 4 bases
+    fit into one byte. Letters that are not A, C, G or T are stored as "N" blocks
+    (start, length) per record. The file is read back memory-mapped: opening it only
+    reads the small record table, the bases themselves are read from disk when needed.
+    ArianeNeumannQ2a.py and ArianeNeumannQ2b.py read their input with read_sequence and
+    read_records from this module, which take a fasta or a ".2bit" file.
+
+File layout:
+    b"PY2BIT01" | packed bases + N blocks of every record | JSON record table | 8 byte offset of the table
+    (the table is at the end, so records can be written one after the other while reading the fasta)
+
+User defined functions:
+    fasta_to_2bit, open_2bit, twobit_names, twobit_packed, twobit_sequence, twobit_chunks, read_2bit_sequence,
+    read_sequence, read_records, total_length
+
+Input:
+    fasta file (.fa, .fna, .fasta)
+
+Output:
+    2-bit genome file (.2bit)
+
+Usage:
+    python3 genome2bit.py input_file output_file
+
+Version: 1.0 Date 2025-11-06 Author: Ariane Neumann
+"""
+import os
+import sys
+import json
+import numpy as np
+import seq_parser
+
+MAGIC = b"PY2BIT01"
+
+#========================== Defining functions =================================
+
+# Base codes for packing, every other letter gets code 0 and is remembered as an N block
+BASE_CODES = np.zeros(256, dtype=np.uint8)
+for code, base in enumerate(b"ACGT"):
+    BASE_CODES[base] = code
+IS_BASE = np.zeros(256, dtype=bool)
+IS_BASE[list(b"ACGT")] = True
+
+# Lookup table from one packed byte to its 4 letters, used for unpacking many bytes at once
+UNPACK_TABLE = np.array([[b"ACGT"[(byte >> shift) & 3] for shift in (6, 4, 2, 0)] for byte in range(256)],
+                        dtype=np.uint8)
+
+# Defining function to read a fasta file record by record (name, upper case sequence as bytes)
+def fasta_records(fasta_file: str):
+    for header, sequence in seq_parser.read_fasta_records(fasta_file):
+        yield seq_parser.record_name(header), sequence.upper() # first word of header is the record name
+
+# Defining function to pack one sequence. Returns the packed bytes and the N blocks (starts, lengths)
+def pack_sequence(sequence: bytes):
+    letters = np.frombuffer(sequence, dtype=np.uint8)
+    codes = BASE_CODES[letters]
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8) # filled up to a multiple of 4
+    padded[:len(codes)] = codes
+    packed = (padded[0::4] << 6) | (padded[1::4] << 4) | (padded[2::4] << 2) | padded[3::4]
+
+    # N blocks: where the "is not ACGT" flag switches on and off
+    other = np.concatenate([[False], ~IS_BASE[letters], [False]])
+    changes = np.flatnonzero(other[1:] != other[:-1])
+    n_starts = changes[0::2]
+    n_lengths = changes[1::2] - n_starts
+    return packed.tobytes(), n_starts.astype(np.uint64), n_lengths.astype(np.uint64)
+
+# Defining function to convert a fasta file into a 2-bit file. Only one record is in memory at a time.
+# Records are looked up by name later, so two records with the same name stop the conversion
+def fasta_to_2bit(fasta_file: str, output_file: str) -> int:
+    records = []
+    names = set()
+    with open(output_file, "wb") as out:
+        out.write(MAGIC)
+        for name, sequence in fasta_records(fasta_file):
+            if name in names:
+                raise ValueError(f"Record name '{name}' is in '{fasta_file}' more than once")
+            names.add(name)
+            packed, n_starts, n_lengths = pack_sequence(sequence)
+            record = {"name": name, "length": len(sequence), "packed_offset": out.tell(), "n_blocks": len(n_starts)}
+            out.write(packed)
+            record["n_offset"] = out.tell()
+            out.write(n_starts.tobytes())
+            out.write(n_lengths.tobytes())
+            records.append(record)
+        table_offset = out.tell()
+        out.write(json.dumps(records).encode())
+        out.write(np.uint64(table_offset).tobytes())
+    return len(records)
+
+# Defining function to open a 2-bit file memory-mapped. Nothing is copied, the returned dict holds
+# the mapped file and the record table (name -> length, offsets, N blocks)
+def open_2bit(twobit_file: str) -> dict:
+    data = np.memmap(twobit_file, dtype=np.uint8, mode="r")
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"'{twobit_file}' is not a 2-bit genome file made by genome2bit.py")
+    table_offset = int(data[-8:].view(np.uint64)[0])
+    records = {}
+    for record in json.loads(bytes(data[table_offset:-8])):
+        n_offset, n_blocks = record["n_offset"], record["n_blocks"]
+        record["n_starts"] = data[n_offset:n_offset + 8 * n_blocks].view(np.uint64)
+        record["n_lengths"] = data[n_offset + 8 * n_blocks:n_offset + 16 * n_blocks].view(np.uint64)
+        records[record["name"]] = record
+    return {"data": data, "records": records}
+
+# Defining function listing the record names in file order
+def twobit_names(genome: dict) -> list:
+    return list(genome["records"])
+
+# Defining function giving the packed bytes of a record as a view into the mapped file (no copy)
+def twobit_packed(genome: dict, name: str) -> np.ndarray:
+    record = genome["records"][name]
+    return genome["data"][record["packed_offset"]:record["packed_offset"] + (record["length"] + 3) // 4]
+
+# Defining function to unpack part of a record (0-based, end excluded) into an upper case string.
+# Only the bytes of this part are read from disk
+def twobit_sequence(genome: dict, name: str, start: int = 0, end: int = None) -> str:
+    record = genome["records"][name]
+    end = record["length"] if end is None else min(end, record["length"])
+    if start >= end:
+        return ""
+    packed = twobit_packed(genome, name)[start // 4:(end + 3) // 4]
+    letters = UNPACK_TABLE[packed].reshape(-1)[start % 4:start % 4 + end - start]
+
+    # putting the N blocks back that overlap this part
+    n_starts = record["n_starts"].astype(np.int64)
+    n_ends = n_starts + record["n_lengths"].astype(np.int64)
+    for n_start, n_end in zip(n_starts[(n_ends > start) & (n_starts < end)].tolist(),
+                              n_ends[(n_ends > start) & (n_starts < end)].tolist()):
+        letters[max(n_start, start) - start:min(n_end, end) - start] = ord("N")
+    return letters.tobytes().decode("ascii")
+
+# Defining function to unpack a record piece by piece, so memory stays at chunk_size letters
+def twobit_chunks(genome: dict, name: str, chunk_size: int = 1 << 20):
+    length = genome["records"][name]["length"]
+    for start in range(0, length, chunk_size):
+        yield twobit_sequence(genome, name, start, start + chunk_size)
+
+# Defining function to get all records joined into one string, like read_sequence does for fasta
+def read_2bit_sequence(twobit_file: str) -> str:
+    genome = open_2bit(twobit_file)
+    return "".join(twobit_sequence(genome, name) for name in twobit_names(genome))
+
+# Defining function to read the whole input file (fasta or .2bit) as one upper case string, all records joined
+def read_sequence(input_file: str) -> str:
+    if input_file.endswith(".2bit"): # packed genome, no text parsing needed
+        return read_2bit_sequence(input_file)
+    sequence = b"".join(chunk for _, _, chunk in seq_parser.read_fasta_chunks(input_file)) # header lines are left out by the parser
+    return sequence.upper().decode("ascii", "replace") # making sure that sequence letters all capital case
+
+# Defining function to read a multi-record input file (fasta or .2bit) one record at a time, so records
+# are not merged as in read_sequence. Yields (record name, upper case sequence)
+def read_records(input_file: str):
+    if input_file.endswith(".2bit"):
+        genome = open_2bit(input_file)
+        for name in twobit_names(genome):
+            yield name, twobit_sequence(genome, name)
+        return
+    for header, sequence in seq_parser.read_fasta_records(input_file):
+        yield seq_parser.record_name(header), sequence.upper().decode("ascii", "replace") # first word of header is the record name
+
+# Defining function for the total number of bases of all records, read chunk by chunk (fasta) or taken
+# from the record table (.2bit), so nothing has to be read into memory
+def total_length(input_file: str) -> int:
+    if input_file.endswith(".2bit"):
+        genome = open_2bit(input_file)
+        return sum(genome["records"][name]["length"] for name in twobit_names(genome))
+    return sum(len(chunk) for _, _, chunk in seq_parser.read_fasta_chunks(input_file))
+
+#============================= Calling functions ==============================
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python3 genome2bit.py input_file output_file")
+        sys.exit(1)
+    try:
+        record_count = fasta_to_2bit(sys.argv[1], sys.argv[2])
+    except ValueError as e:
+        os.remove(sys.argv[2]) # half written file without record table
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"{record_count} record(s) written to {sys.argv[2]}")
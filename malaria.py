@@ -46,6 +46,7 @@ So here is now formatted documentation section.
 #%% Preparation of the script
 
 import sys
+import seq_parser
 
 if len(sys.argv) != 4:
     sys.argv = ["malaria.py", "malaria.fna", "malaria.blastx.tab", "output.txt"] 
@@ -97,35 +98,19 @@ print("="*80)
 
 fasta_header = [] # create a list to store headers
 fasta_sequences = [] # creates a list to store the sequences
-seq_fragments = [] # creates a temporary list for multi line sequence assembly
-current_header = ''
 counter = 1
 
-with open(fasta_malaria, "r") as r: # with open safely closes files even if errors occur
-    for line in r: # FOR loop
-        print(f"{counter}, {line.strip()}") #debugging print statement
-        
-        if line.startswith('>'): #fasta files start with this sign
-            print("Header line") #debugging statement, confirming header is found
-            
-            if seq_fragments:
-                print("Please combine previous sequence")
-                full_seq = ''.join(seq_fragments)
-                fasta_sequences.append(full_seq)
-                seq_fragments = []
-                
-            current_header = line.strip()
-            fasta_header.append(current_header)
-        else:
-            print("A sequence line detected")
-            seq_fragments.append(line.strip())
-            
-        counter += 1
-        
-    if seq_fragments:
-        print("Please combine last sequence")
-        full_seq = ''.join(seq_fragments)
-        fasta_sequences.append(full_seq)
+# seq_parser reads the fasta file in big blocks and already joins multi line sequences,
+# so every header gets exactly one sequence (also an empty one), and the two lists stay in step
+for header, sequence in seq_parser.read_fasta_records(fasta_malaria):
+    if header is None:
+        print("Skipping sequence lines before the first header")
+        continue
+    current_header = ">" + header.decode()
+    print(f"{counter}, {current_header}") #debugging print statement, one line per record
+    fasta_header.append(current_header)
+    fasta_sequences.append(sequence.decode())
+    counter += 1
         
 print("\nI finished reading malaria.fna")
 print(f"Total sequence read is: {len(fasta_header)}\n")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script name:
+    seq_parser.py
+
+Description:
+    One FASTA/FASTQ parser for all scripts of this repository (ArianeNeumannQ2a.py,
+    ArianeNeumannQ2b.py, dna2protein.py, aa_count.py, malaria.py, barcode_trim.py and
+    genome2bit.py), so they all handle the same edge cases in the same way:
+    empty lines, Windows line endings, a missing newline at the end of the file,
+    headers without sequence and sequence lines before the first header.
+    The file is read in large binary blocks, records are found with bytes.find
+    (done in C) and the sequence lines are joined with one bytes.translate call,
+    instead of going through the file line by line with string concatenation.
+    Everything is given back lazily as bytes, one record (or chunk) at a time.
+    Gzip compressed files (also BGZF) are found by their first two bytes and read
+    decompressed, no matter how the file is named.
+
+User defined functions:
+    read_fasta_chunks, read_fasta_records, read_fastq_blocks, fastq_block_records,
+    read_fastq_records, record_name, open_input, is_compressed, ordered_pool_map
+
+Procedure:
+    1. Read a block of the file (FASTQ: keep the incomplete last record for the next block, its start is
+       found by counting newlines, FASTA: only an incomplete header line is kept, sequence is given out
+       up to the block end)
+    2. Find the header lines (b"\n>") and cut the block into header and sequence parts
+    3. Remove newlines and spaces from the sequence parts and yield them
+
+Usage:
+    import seq_parser
+    for header, sequence in seq_parser.read_fasta_records("genome.fna"): ...
+    for header, seq, plus, qual in seq_parser.read_fastq_records("reads.fastq"): ...
+    for block in seq_parser.read_fastq_blocks("reads.fastq"): ... (whole records, e.g. for worker processes)
+    for result in seq_parser.ordered_pool_map(pool, function, blocks, ahead): ... (results in block order)
+
+Version: 1.0 Date 2025-11-13 Author: Ariane Neumann
+"""
+
+import gzip
+from collections import deque
+
+BLOCK_SIZE = 1 << 22 # 4 MB per read
+GZIP_MAGIC = b"\x1f\x8b" # first two bytes of every gzip file
+WHITESPACE = b" \t\r\n\v\f"
+
+#========================== Defining functions =================================
+
+# Defining function checking if a file is gzip compressed (also BGZF), from its first two bytes
+def is_compressed(file_path):
+    with open(file_path, "rb") as a:
+        return a.read(2) == GZIP_MAGIC
+
+# Defining function to open a file for reading bytes. Gzip files are decompressed while reading
+def open_input(file_path):
+    return gzip.open(file_path, "rb") if is_compressed(file_path) else open(file_path, "rb")
+
+# Defining function reading a file in blocks of block_size bytes (decompressed). With start/end only
+# this byte range is read, which is only possible for uncompressed files (byte positions of the file)
+def _raw_blocks(file_path, block_size, start=0, end=None):
+    if (start or end is not None) and is_compressed(file_path):
+        raise ValueError(f"'{file_path}' is gzip compressed, byte ranges can only be read from uncompressed files")
+    with open_input(file_path) as a:
+        a.seek(start)
+        remaining = end - start if end is not None else None
+        while remaining is None or remaining > 0:
+            block = a.read(block_size if remaining is None else min(block_size, remaining))
+            if not block:
+                break
+            if remaining is not None:
+                remaining -= len(block)
+            yield block
+
+# Defining function for the FASTA parser. Yields (record number, header, sequence chunk) with
+# record number 0, 1, 2, ... and the header without ">" and without the newline. The file is read in
+# blocks that are cut anywhere, also inside a sequence line: the sequence up to the end of the block is
+# given out as a chunk right away, so a long record (even a whole chromosome on one line) comes in
+# chunks of about block_size and not even one record has to fit into memory. Only a header line that
+# is cut by the block end is kept until its end is read.
+# Every record gives at least one chunk (b"" for a header without sequence). Sequence found before
+# the first header gets record number -1 and header None.
+# start/end read only this byte range of an uncompressed file, start has to be at the beginning of a line
+def read_fasta_chunks(file_path, block_size=BLOCK_SIZE, start=0, end=None):
+    number = -1
+    header = None
+    header_parts = None # pieces of a header line that is not complete yet
+    line_start = True # the next byte is the first of a line
+    for block in _raw_blocks(file_path, block_size, start, end):
+        position = 0
+        if header_parts is not None: # header line from the previous block goes on
+            line_end = block.find(b"\n")
+            if line_end < 0:
+                header_parts.append(block)
+                continue
+            header_parts.append(block[:line_end])
+            number += 1
+            header = b"".join(header_parts).rstrip(WHITESPACE)
+            header_parts = None
+            yield number, header, b""
+            position = line_end + 1
+            line_start = True
+        while position < len(block):
+            if line_start and block.startswith(b">", position): # header line
+                line_end = block.find(b"\n", position)
+                if line_end < 0: # header goes on in the next block
+                    header_parts = [block[position + 1:]]
+                    break
+                number += 1
+                header = block[position + 1:line_end].rstrip(WHITESPACE)
+                yield number, header, b""
+                position = line_end + 1
+                continue
+            next_header = block.find(b"\n>", position) # sequence goes until the next header line
+            if next_header < 0: # or until the end of the block, maybe in the middle of a line
+                part_end = len(block)
+                line_start = block.endswith(b"\n")
+            else:
+                part_end = next_header + 1
+                line_start = True
+            chunk = block[position:part_end].translate(None, WHITESPACE)
+            if chunk:
+                yield number, header, chunk
+            position = part_end
+    if header_parts is not None: # last line of the file is a header without newline
+        yield number + 1, b"".join(header_parts).rstrip(WHITESPACE), b""
+
+# Defining function giving complete FASTA records as (header, sequence), both bytes, one at a time
+def read_fasta_records(file_path, block_size=BLOCK_SIZE):
+    current = None
+    header = None
+    pieces = []
+    for number, chunk_header, chunk in read_fasta_chunks(file_path, block_size):
+        if number != current:
+            if current is not None:
+                yield header, b"".join(pieces)
+            current, header, pieces = number, chunk_header, []
+        if chunk:
+            pieces.append(chunk)
+    if current is not None:
+        yield header, b"".join(pieces)
+
+# Defining function for the name of a record: first word of the header, "unnamed" if there is none
+def record_name(header):
+    words = header.split() if header else []
+    return words[0].decode() if words else "unnamed"
+
+# Defining function going through data line by line and giving the end of its last complete record
+# (after every 4th line). An empty line between two records is not counted as a line of a record
+def _fastq_cut_lines(data):
+    cut = position = lines = 0
+    for line in data.split(b"\n")[:-1]:
+        position += len(line) + 1
+        if lines % 4 == 0 and not line.rstrip(b"\r"):
+            continue # empty line between two records
+        lines += 1
+        if lines % 4 == 0:
+            cut = position
+    return cut
+
+# Defining function finding a record border near the end of data (data starts with a record and has
+# `newlines` newlines). The newlines are only counted, and a few rfind from the end give the start of the
+# last record that has at least 3 complete lines. This is a real record start if its line begins with "@"
+# and the line two further begins with "+" (a quality line starting with "@" is followed by a header and a
+# sequence, never by "+"). Everything before it is whole records, also if there are empty lines in between.
+# Only when this check fails (e.g. empty lines moved the count) the data is gone through line by line
+def _fastq_cut(data, newlines):
+    line = 4 * ((newlines - 3) // 4) # first line of the last record, its lines up to the "+" line are complete
+    if line <= 0:
+        return _fastq_cut_lines(data) if newlines >= 4 else 0
+    cut = len(data)
+    for _ in range(newlines - line + 1): # back to the newline before that line
+        cut = data.rfind(b"\n", 0, cut)
+    cut += 1
+    plus_line = data.find(b"\n", data.find(b"\n", cut) + 1) + 1
+    if data.startswith(b"@", cut) and data.startswith(b"+", plus_line):
+        return cut
+    return _fastq_cut_lines(data)
+
+# Defining function giving the FASTQ file as blocks of complete records (bytes, every line ends with "\n").
+# The blocks are slices of the file as it is, cut after the last complete record, so a block can be
+# cut into records with fastq_block_records without looking at the rest of the file, e.g. in another
+# process. Empty lines between records stay in the block, fastq_block_records leaves them out
+def read_fastq_blocks(file_path, block_size=BLOCK_SIZE):
+    rest = [] # pieces of the data after the last complete record, moved to the next block
+    newlines = 0 # newlines in rest
+    for block in _raw_blocks(file_path, block_size):
+        rest.append(block)
+        newlines += block.count(b"\n")
+        if newlines < 4: # not even one record complete, a very long read is collected piece by piece
+            continue
+        data = b"".join(rest) if len(rest) > 1 else block
+        cut = _fastq_cut(data, newlines)
+        if cut:
+            yield data[:cut]
+        rest = [data[cut:]] if cut < len(data) else []
+        newlines = rest[0].count(b"\n") if rest else 0
+    if rest:
+        data = b"".join(rest)
+        if not data.endswith(b"\n"): # last line without newline at the end of the file
+            data += b"\n"
+        cut = _fastq_cut_lines(data) # the last record has to be complete, so every line is looked at
+        if cut:
+            yield data[:cut]
+        if data[cut:].strip():
+            raise ValueError(f"FASTQ file '{file_path}' ends with an incomplete record")
+
+# Defining function cutting a block from read_fastq_blocks into (header, sequence, plus line, quality).
+# Empty lines between records are left out here, which is only needed when the block has any
+def fastq_block_records(block):
+    lines = block.split(b"\n")[:-1]
+    if b"\r" in block: # Windows line endings
+        lines = [line.rstrip(b"\r") for line in lines]
+    if b"" in lines:
+        kept = []
+        for line in lines:
+            if len(kept) % 4 == 0 and not line:
+                continue # empty line between two records
+            kept.append(line)
+        lines = kept
+    return zip(lines[0::4], lines[1::4], lines[2::4], lines[3::4])
+
+# Defining function for the FASTQ parser. Yields (header, sequence, plus line, quality) as bytes for
+# every record of 4 lines, without newlines. Empty lines between records are skipped
+def read_fastq_records(file_path, block_size=BLOCK_SIZE):
+    for block in read_fastq_blocks(file_path, block_size):
+        yield from fastq_block_records(block)
+
+# Defining a generator giving function(task) for every task in task order, computed on a multiprocessing pool.
+# Only `ahead` tasks are on the way at the same time (Pool.imap would take all tasks at once), so a large
+# file is not read into memory ahead of the one using the results, e.g. a writer
+def ordered_pool_map(pool, function, tasks, ahead):
+    pending = deque() # results in task order
+    for task in tasks:
+        pending.append(pool.apply_async(function, (task,)))
+        if len(pending) >= ahead:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()